@@ -0,0 +1,70 @@
+# Time per call of built-ins, methods and Text functions, measured against a
+# loop that does the same work without the call.
+#
+# Usage: python benchmarks/call_overhead.py
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.setrecursionlimit(100000)
+
+from runtime import runtime
+
+CALLS = 5000
+REPEATS = 3
+
+LOOP = """
+items = [1, 2, 3]
+identity = { arguments[0] }
+i = 0
+
+while (i < CALLS) {
+    BODY
+    i = i + 1
+}
+"""
+
+BODIES = {
+    'empty loop': 'items',
+    'built-in': 'length(items)',
+    'method': 'items.contains(2)',
+    'Text function': 'identity(items)',
+}
+
+def new_context():
+    context = runtime.Context('<benchmark>', runtime.default_context)
+    context.symbol_table = runtime.SymbolTable(runtime.default_symbol_table)
+
+    return context
+
+def measure(body: str) -> float:
+    text = LOOP.replace('CALLS', str(CALLS)).replace('BODY', body)
+    timings = []
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+
+        result, error = runtime.run('<benchmark>', text, new_context())
+        if error: raise SystemExit(error.as_string())
+
+        timings.append((time.perf_counter() - start) / CALLS)
+
+    return min(timings)
+
+def main():
+    print(f"{'':<20}{'per iteration':>16}{'call overhead':>16}")
+
+    for engine in runtime.ENGINES:
+        runtime.set_engine(engine)
+        print(engine)
+
+        baseline = measure(BODIES['empty loop'])
+
+        for name, body in BODIES.items():
+            timing = measure(body)
+            print(f'    {name:<16}{timing * 1000000:>14.2f}us{(timing - baseline) * 1000000:>14.2f}us')
+
+if __name__ == '__main__':
+    main()
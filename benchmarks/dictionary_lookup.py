@@ -0,0 +1,43 @@
+# Lookup time in dictionaries of increasing size. Keys hash by value, so the
+# time per lookup stays constant up to 100k keys.
+#
+# Usage: python benchmarks/dictionary_lookup.py
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from runtime import runtime
+
+SIZES = (1000, 10000, 100000)
+LOOKUPS = 10000
+
+KEYS = {
+    'text': lambda index: runtime.Text(f'key{index}'),
+    'number': lambda index: runtime.Number(index),
+    'list': lambda index: runtime.List([runtime.Number(index), runtime.Text('key')]),
+}
+
+def measure(make_key, size: int) -> float:
+    dictionary = runtime.Dictionary({ make_key(index).frozen(): runtime.Number(index) for index in range(size) })
+    keys = [make_key(index * (size // LOOKUPS or 1) % size) for index in range(LOOKUPS)]
+
+    start = time.perf_counter()
+
+    for key in keys:
+        result = dictionary.index(key)
+        if result.error: raise SystemExit(result.error)
+
+    return (time.perf_counter() - start) / LOOKUPS
+
+def main():
+    print(f"{'keys':<10}" + ''.join(f'{f"{size} keys":>16}' for size in SIZES))
+
+    for name, make_key in KEYS.items():
+        timings = [measure(make_key, size) for size in SIZES]
+        print(f'{name:<10}' + ''.join(f'{timing * 1000000:>14.2f}us' for timing in timings))
+
+if __name__ == '__main__':
+    main()
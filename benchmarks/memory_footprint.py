@@ -0,0 +1,87 @@
+# Size of the objects the interpreter creates most often, and the peak memory
+# of a loop-heavy script that keeps many values and nodes alive.
+#
+# Usage: python benchmarks/memory_footprint.py
+
+import sys
+import time
+import resource
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.setrecursionlimit(100000)
+
+from runtime import runtime
+
+WORKLOAD = """
+items = []
+i = 0
+
+while (i < 5000) {
+    items = items + [[i, "item", |"index": i|]]
+    i = i + 1
+}
+"""
+
+def object_size(object) -> int:
+    size = sys.getsizeof(object)
+
+    if hasattr(object, '__dict__'):
+        size += sys.getsizeof(object.__dict__)
+
+    return size
+
+def samples() -> dict:
+    source = runtime.SourceFile('<benchmark>', '1 + 2')
+    token = runtime.Token(runtime.TT_NUMBER, 1.0, source, 0)
+    number_node = runtime.NumberNode(token)
+
+    return {
+        'Number': runtime.Number(1),
+        'Text': runtime.Text('text'),
+        'List': runtime.List([]),
+        'Dictionary': runtime.Dictionary({}),
+        'Null': runtime.Null(),
+        'BuiltIn': runtime.BuiltIn(runtime.built_ins['print']),
+        'Token': token,
+        'Position': source.position(0),
+        'NumberNode': number_node,
+        'BinaryOperationNode': runtime.BinaryOperationNode(number_node, token, number_node),
+        'RuntimeResult': runtime.RuntimeResult(),
+        'ParseResult': runtime.ParseResult(),
+        'Context': runtime.Context('<benchmark>'),
+        'SymbolTable': runtime.SymbolTable(),
+    }
+
+def new_context():
+    context = runtime.Context('<benchmark>', runtime.default_context)
+    context.symbol_table = runtime.SymbolTable(runtime.default_symbol_table)
+
+    return context
+
+def main():
+    for name, object in samples().items():
+        print(f'{name:<20}{object_size(object):>8} bytes')
+
+    start = time.perf_counter()
+
+    result, error = runtime.run('<benchmark>', WORKLOAD, new_context())
+    if error: raise SystemExit(error)
+
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    runtime.run('<benchmark>', WORKLOAD, new_context())
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print()
+    print(f"{'workload time':<20}{elapsed:>8.2f} s")
+    print(f"{'peak RSS':<20}{rss / 2 ** 10:>8.1f} MB")
+    print(f"{'traced peak':<20}{peak / 2 ** 20:>8.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# Time of a loop over constant expressions, branches and literals with and
+# without the optimizer, followed by the changes the optimizer made.
+#
+# Usage: python benchmarks/optimizer.py
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.setrecursionlimit(100000)
+
+from runtime import runtime
+
+ITERATIONS = 5000
+REPEATS = 3
+
+WORKLOAD = """
+i = 0
+total = 0
+
+while (i < ITERATIONS) {
+    total = total + 60 * 60 * 24
+    weights = [1, 2, 3, 4]
+    limits = |"low": 10, "high": 100|
+
+    if (true) {
+        total = total + 1
+    } else {
+        total = total - 1
+    }
+
+    i = i + 1
+}
+"""
+
+def new_context():
+    context = runtime.Context('<benchmark>', runtime.default_context)
+    context.symbol_table = runtime.SymbolTable(runtime.default_symbol_table)
+
+    return context
+
+def measure() -> float:
+    text = WORKLOAD.replace('ITERATIONS', str(ITERATIONS))
+    timings = []
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+
+        result, error = runtime.run('<benchmark>', text, new_context())
+        if error: raise SystemExit(error.as_string())
+
+        timings.append((time.perf_counter() - start) / ITERATIONS)
+
+    return min(timings)
+
+def main():
+    print(f"{'':<12}{'plain':>16}{'optimized':>16}")
+
+    for engine in runtime.ENGINES:
+        runtime.set_engine(engine)
+
+        runtime.set_optimization(False)
+        plain = measure()
+
+        runtime.set_optimization(True)
+        optimized = measure()
+
+        print(f'{engine:<12}{plain * 1000000:>14.2f}us{optimized * 1000000:>14.2f}us')
+
+    # Cached ASTs are dropped when the setting changes, so the workload is optimized again
+    runtime.set_optimization(False)
+    runtime.set_optimization(True, True)
+
+    print()
+    runtime.run('<benchmark>', WORKLOAD.replace('ITERATIONS', str(ITERATIONS)), new_context())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# Parse time of deeply nested expressions. With memoized parser rules the
+# time per nesting level stays constant, so the totals grow linearly.
+#
+# Usage: python benchmarks/parser_nesting.py
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.setrecursionlimit(100000)
+
+from runtime import runtime
+
+SHAPES = {
+    'parentheses': lambda depth: '(' * depth + '1' + ')' * depth,
+    'indexing': lambda depth: 'a[' * depth + '0' + ']' * depth,
+    'calls': lambda depth: 'f(' * depth + '1' + ')' * depth,
+    'lists': lambda depth: '[' * depth + '1' + ']' * depth,
+}
+
+DEPTHS = (25, 50, 100, 200)
+
+def measure(text: str) -> float:
+    tokens, error = runtime.make_tokens('<benchmark>', text)
+    if error: raise SystemExit(error)
+
+    start = time.perf_counter()
+    result = runtime.generate_ast(tokens)
+    elapsed = time.perf_counter() - start
+
+    if result.error: raise SystemExit(result.error)
+    return elapsed
+
+def main():
+    print(f"{'shape':<12}" + ''.join(f'{f"depth {depth}":>14}' for depth in DEPTHS) + f"{'per level':>14}")
+
+    for name, make_text in SHAPES.items():
+        timings = [measure(make_text(depth)) for depth in DEPTHS]
+        per_level = timings[-1] / DEPTHS[-1]
+
+        print(f'{name:<12}' + ''.join(f'{timing * 1000:>12.2f}ms' for timing in timings) + f'{per_level * 1000:>12.3f}ms')
+
+if __name__ == '__main__':
+    main()
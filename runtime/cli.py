@@ -28,15 +28,45 @@ with importlib.resources.path('runtime', 'data') as data_path:
     DATA_DIRECTORY = data_path
 
 def main():
-    if len(argv) == 1:
+    arguments = argv[1:]
+    optimize = False
+    verbose = False
+
+    while len(arguments) > 0 and arguments[0] in ("--engine", "--optimize", "--verbose"):
+        if arguments[0] == "--optimize":
+            optimize = True
+            arguments = arguments[1:]
+            continue
+
+        if arguments[0] == "--verbose":
+            verbose = True
+            arguments = arguments[1:]
+            continue
+
+        if len(arguments) < 2:
+            print("No engine provided")
+            return
+        
+        engine = arguments[1].strip()
+
+        if engine not in runtime.ENGINES:
+            print(f"Unknown engine: {engine}. Available engines: {', '.join(runtime.ENGINES)}")
+            return
+        
+        runtime.set_engine(engine)
+        arguments = arguments[2:]
+
+    if optimize: runtime.set_optimization(True, verbose)
+
+    if len(arguments) == 0:
         repl()
-    elif argv[1] == "--set-api-key":
-        if len(argv) > 2:
-            save_config({"api_key": argv[2].strip() })
+    elif arguments[0] == "--set-api-key":
+        if len(arguments) > 1:
+            save_config({"api_key": arguments[1].strip() })
         else:
             print("No API key provided")
     else:
-        file_name = argv[1].strip()
+        file_name = arguments[0].strip()
         run(file_name)
 
 def run(file_name, log = True):
@@ -50,7 +80,7 @@ def run(file_name, log = True):
         with open(path, 'r') as file:
             text = file.read()
 
-            result, error = runtime.run(file_name, text)
+            result, error = runtime.run(file_name, text, path = path)
             if error: print(error)
         
     except KeyboardInterrupt:
@@ -2,16 +2,28 @@
 #region IMPORTS
 
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import OrderedDict
 from colorama import Fore, Back
 from string import ascii_letters
 from types import FunctionType, BuiltinFunctionType
 from time import sleep
+from sys import intern, stderr
 import requests
 import json
 import math
 import random
+import re
+import hashlib
+import os
+import operator
+import pickle
+import struct
+import tempfile
+import weakref
+import zlib
 from pathlib import Path
-from platformdirs import user_config_dir
+from platformdirs import user_config_dir, user_cache_dir
 
 #endregion
 
@@ -97,42 +109,100 @@ class RuntimeError(Error):
         return output
     
     def generate_traceback(self) -> str:
-        output = ''
+        lines = []
         position = self.start_position.copy()
         context = self.context
 
         while context:
-            output = f'\nFile: {position.file_name}. Line {position.line + 1}, in {context.display_name}' + output
+            lines.append(f'\nFile: {position.file_name}. Line {position.line + 1}, in {context.display_name}')
             position = context.parent_entry_position
             context = context.parent
 
-        return color('Traceback:', Back.LIGHTBLUE_EX) + output
+        # Joined once, deep recursion can have hundreds of thousands of entries
+        return color('Traceback:', Back.LIGHTBLUE_EX) + ''.join(reversed(lines))
 
 #endregion
 
 
 #region POSITION
 
+class SourceFile:
+    __slots__ = ('file_name', 'text', 'line_starts')
+
+    def __init__(self, file_name, text):
+        self.file_name = file_name
+        self.text = text
+        self.line_starts = None
+
+    def solve(self, index: int) -> tuple[int, int]:
+        if self.line_starts is None:
+            self.line_starts = [0] + [match.end() for match in re.finditer('\n', self.text)]
+
+        # Indices past the end of the text keep advancing on the last line
+        clamped_index = min(index, len(self.text))
+        line = bisect_right(self.line_starts, clamped_index) - 1
+        column = clamped_index - self.line_starts[line] + (index - clamped_index)
+
+        return line, column
+    
+    def position(self, index: int) -> 'Position':
+        return Position(index, self)
+    
+    def end_position(self, index: int) -> 'Position':
+        return Position(index, self, end = True)
+
 class Position:
-    def __init__(self, index, line, column, file_name = None, file_text = None):
+    __slots__ = ('index', 'source', 'line_column', 'end')
+
+    def __init__(self, index, source: SourceFile, line = None, column = None, end = False):
         self.index = index
-        self.line = line
-        self.column = column
-        self.file_name = file_name
-        self.file_text = file_text
+        self.source = source
+        self.line_column = (line, column) if line is not None else None
+        self.end = end
+
+    def solve(self) -> tuple[int, int]:
+        if self.line_column is None:
+            if self.end:
+                # End positions sit right after the last character, on its line
+                line, column = self.source.solve(self.index - 1)
+                self.line_column = (line, column + 1)
+            else:
+                self.line_column = self.source.solve(self.index)
+
+        return self.line_column
+
+    @property
+    def line(self) -> int:
+        return self.solve()[0]
+    
+    @property
+    def column(self) -> int:
+        return self.solve()[1]
+    
+    @property
+    def file_name(self):
+        return self.source.file_name
+    
+    @property
+    def file_text(self):
+        return self.source.text
 
     def advance(self, current_character = None):
+        line, column = self.solve()
+
         self.index += 1
-        self.column += 1
+        column += 1
 
         if current_character == '\n':
-            self.line += 1
-            self.column = 0
+            line += 1
+            column = 0
 
+        self.line_column = (line, column)
         return self
     
     def copy(self):
-        return Position(self.index, self.line, self.column, self.file_name, self.file_text)
+        line, column = self.line_column if self.line_column is not None else (None, None)
+        return Position(self.index, self.source, line, column, self.end)
     
     def __repr__(self) -> str:
         return f'Index: {self.index}, Line: {self.line}, Column: {self.column}'
@@ -198,15 +268,22 @@ TT_NEW_LINE = "NEW_LINE"
 TT_EOF = "EOF"
 
 class Token:
-    def __init__(self, type_, value = None, start_position: Position | None = None, end_position: Position | None = None):
+    __slots__ = ('type', 'value', 'source', 'start', 'end')
+
+    def __init__(self, type_, value = None, source: SourceFile | None = None, start: int | None = None, end: int | None = None):
         self.type = type_
         self.value = value
-        self.start_position = start_position.copy() if start_position else None
-        self.end_position = end_position.copy() if end_position else None
+        self.source = source
+        self.start = start
+        self.end = end if end is not None or start is None else start + 1
 
-        if self.start_position and not self.end_position:
-            self.end_position = self.start_position.copy()
-            self.end_position.advance()
+    @property
+    def start_position(self) -> Position | None:
+        return self.source.position(self.start) if self.source else None
+    
+    @property
+    def end_position(self) -> Position | None:
+        return self.source.end_position(self.end) if self.source else None
 
     def matches(self, type_, value) -> bool:
         return (self.type == type_) and (self.value == value)
@@ -222,272 +299,208 @@ DIGITS = '0123456789'
 LETTERS = ascii_letters
 LETTERS_DIGITS = LETTERS + DIGITS
 
+SYMBOL_TOKEN_TYPES = {
+    ';': TT_NEW_LINE,
+    '\n': TT_NEW_LINE,
+    '.': TT_DOT,
+    ',': TT_COMMA,
+    '(': TT_OPEN_PARENTHESIS,
+    ')': TT_CLOSE_PARENTHESIS,
+    '+': TT_ADD,
+    '-': TT_SUBTRACT,
+    '*': TT_MULIPLY,
+    '/': TT_DIVIDE,
+    '^': TT_POWER,
+    '[': TT_OPEN_BRACKETS,
+    ']': TT_CLOSE_BRACKETS,
+    '|': TT_PIPE,
+    ':': TT_COLON,
+    '$': TT_VARIABLE,
+    '=': TT_EQUALS,
+    '<': TT_LESS_THAN,
+    '>': TT_GREATER_THAN,
+    '==': TT_DOUBLE_EQUALS,
+    '!=': TT_NOT_EQUALS,
+    '<=': TT_LESS_THAN_OR_EQUALS,
+    '>=': TT_GREATER_THAN_OR_EQUALS
+}
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<whitespace>[ \t]+)
+  | (?P<number>[0-9]+(?:\.[0-9]*)?)
+  | (?P<identifier>[A-Za-z][A-Za-z0-9_~]*)
+  | (?P<line_comment>//[^;\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<double_symbol>==|!=|<=|>=)
+  | (?P<symbol>[;\n.,()+\-*/^\[\]|:$=<>])
+  | (?P<quote>")
+  | (?P<bracket>[{}])
+  | (?P<exclamation>!)
+""", re.VERBOSE)
+
+BRACKET_PATTERN = re.compile(r'[{}]')
+
 class Lexer:
     def __init__(self, file_name, text):
         self.file_name = file_name
         self.text = text
-        self.position = Position(0, 0, 0, file_name, text)
-        self.solve_current_character()
-
-    def solve_current_character(self):
-        if self.position.index < len(self.text):
-            self.current_character = self.text[self.position.index]
-        else:
-            self.current_character = None
-
-    def advance(self):
-        self.position.advance(self.current_character)
-        self.solve_current_character()
+        self.source = SourceFile(file_name, text)
+        self.index = 0
+        self.error = None
 
     def make_tokens(self):
-        tokens = []
-
-        while self.current_character != None:
-            ## General
-            if self.current_character in ' \t':
-                pass
-            elif self.current_character in ';\n':
-                tokens.append(Token(TT_NEW_LINE, start_position = self.position))
-            elif self.current_character in DIGITS:
-                tokens.append(self.make_number())
-                continue
-            elif self.current_character in LETTERS:
-                tokens.append(self.make_identifier())
-                continue
-            elif self.current_character == '.':
-                tokens.append(Token(TT_DOT, start_position = self.position))
-            elif self.current_character == ',':
-                tokens.append(Token(TT_COMMA, start_position = self.position))
-            elif self.current_character == '(':
-                tokens.append(Token(TT_OPEN_PARENTHESIS, start_position = self.position))
-            elif self.current_character == ')':
-                tokens.append(Token(TT_CLOSE_PARENTHESIS, start_position = self.position))
-            
-            ## Math expressions
-            elif self.current_character == '+':
-                tokens.append(Token(TT_ADD, start_position = self.position))
-            elif self.current_character == '-':
-                tokens.append(Token(TT_SUBTRACT, start_position = self.position))
-            elif self.current_character == '*':
-                tokens.append(Token(TT_MULIPLY, start_position = self.position))
-            elif self.current_character == '/':
-                token = self.make_divide_or_comment()
-
-                if token is not None:
-                    tokens.append(token)
+        tokens = list(self.generate_tokens())
+        if self.error: return [], self.error
 
-                continue
-            elif self.current_character == '^':
-                tokens.append(Token(TT_POWER, start_position = self.position))
+        return tokens, None
 
-            ## Text
-            elif self.current_character in '"{}':
-                token, error = self.make_text()
-                if error: return [], error
+    def generate_tokens(self):
+        # On error, yields a final EOF token and leaves the error in self.error
+        text = self.text
+        source = self.source
+        length = len(text)
+        match_token = TOKEN_PATTERN.match
 
-                tokens.append(token)
-                continue
+        while self.index < length:
+            index = self.index
+            match = match_token(text, index)
 
-            ## Lists
-            elif self.current_character == '[':
-                tokens.append(Token(TT_OPEN_BRACKETS, start_position = self.position))
-            elif self.current_character == ']':
-                tokens.append(Token(TT_CLOSE_BRACKETS, start_position = self.position))
-
-            ## Dictionaries
-            elif self.current_character == "|":
-                tokens.append(Token(TT_PIPE, start_position = self.position))
-            elif self.current_character == ":":
-                tokens.append(Token(TT_COLON, start_position = self.position))
-            
-            ## Comparisons
-            elif self.current_character == '=':
-                tokens.append(self.make_equals())
-                continue
-            elif self.current_character == '!':
-                token, error = self.make_not_equals()
-                if error: return [], error
+            if match is None:
+                self.error = IllegalCharacterError(source.position(index), source.position(index + 1), text[index])
+                break
 
-                tokens.append(token)
-                continue
-            elif self.current_character == '<':
-                tokens.append(self.make_less_than())
-                continue
-            elif self.current_character == '>':
-                tokens.append(self.make_greater_than())
-                continue
+            kind = match.lastgroup
+            end = match.end()
 
-            ## Variables
-            elif self.current_character == '$':
-                tokens.append(Token(TT_VARIABLE, start_position = self.position))
+            if kind == 'whitespace' or kind == 'line_comment':
+                self.index = end
 
-            ##
+            elif kind == 'number':
+                yield Token(TT_NUMBER, float(match.group()), source, index, end)
+                self.index = end
 
-            else:
-                character = self.current_character
+            elif kind == 'identifier':
+                identifier_string = match.group()
+                token_type = TT_KEYWORD if identifier_string in KEYWORDS else TT_IDENTIFIER
 
-                start_position = self.position.copy()
-                self.advance()
-                end_position = self.position.copy()
+                yield Token(token_type, identifier_string, source, index, end)
+                self.index = end
 
-                return [], IllegalCharacterError(start_position, end_position, character)
+            elif kind == 'symbol' or kind == 'double_symbol':
+                yield Token(SYMBOL_TOKEN_TYPES[match.group()], None, source, index, end)
+                self.index = end
 
-            self.advance()
+            elif kind == 'block_comment':
+                # The opening '*' may also close the comment, as in '/*/'
+                comment_end = text.find('*/', index + 1)
+                self.index = length if comment_end < 0 else comment_end + 2
 
-        tokens.append(Token(TT_EOF, start_position = self.position))
-        return tokens, None
-    
-    def make_number(self):
-        number_string = ''
-        has_dot = False
-        start_position = self.position.copy()
+            elif kind == 'quote':
+                token, self.error = self.make_text()
+                if self.error: break
 
-        while self.current_character != None and self.current_character in DIGITS + '.':
-            if self.current_character == '.':
-                if has_dot: break
+                yield token
 
-                has_dot = True
-                number_string += '.'
-            else:
-                number_string += self.current_character
+            elif kind == 'bracket':
+                token, self.error = self.make_multiline_text()
+                if self.error: break
 
-            self.advance()
+                yield token
 
-        return Token(TT_NUMBER, float(number_string), start_position, self.position.copy())
+            elif kind == 'exclamation':
+                self.error = ExpectedCharacterError(source.position(index), source.position(index + 2), "'=' after '!'")
+                break
+
+        yield Token(TT_EOF, None, source, self.index)
     
     def make_text(self):
-        text = ''
-        start_position = self.position.copy()
-
-        symbol = self.current_character
-        self.advance()
-
-        if symbol == '"':
-            while self.current_character != None and not self.current_character == symbol:
-                text += self.current_character
-                self.advance()
-
-            if self.current_character == symbol:
-                self.advance()
+        start = self.index
+        end = self.text.find('"', start + 1)
 
-                return Token(TT_TEXT, text, start_position, self.position.copy()), None
-            
-            return None, ExpectedCharacterError(
-                start_position, self.position,
-                "'\"'"
-            )
+        if end < 0:
+            self.index = len(self.text)
+            return None, ExpectedCharacterError(self.source.position(start), self.source.position(self.index), "'\"'")
         
+        self.index = end + 1
+        return Token(TT_TEXT, self.text[start + 1:end], self.source, start, self.index), None
+    
+    def make_multiline_text(self):
+        start = self.index
         bracket_count = 1
 
-        while True:
-            character = self.current_character
-
-            if character == '{':
-                bracket_count += 1
-            if character == '}':
-                bracket_count -= 1
+        for match in BRACKET_PATTERN.finditer(self.text, start + 1):
+            bracket_count += 1 if match.group() == '{' else -1
 
             if bracket_count == 0:
-                self.advance()
+                end = match.start()
+                self.index = end + 1
 
-                return Token(TT_TEXT, text, start_position, self.position.copy()), None
-
-            if not character is None:
-                text += character
-            else:
-                if bracket_count == 1:
-                    return None, ExpectedCharacterError(
-                        start_position, self.position,
-                        "'}'"
-                    )
-                else:
-                    return None, InvalidSyntaxError(
-                        start_position, self.position,
-                        "Unterminated text literal"
-                    )
-                
-            self.advance()
-    
-    def make_identifier(self):
-        identifier_string = ''
-        start_position = self.position.copy()
+                return Token(TT_TEXT, self.text[start + 1:end], self.source, start, self.index), None
 
-        while (self.current_character != None) and (self.current_character in LETTERS_DIGITS + '_~'):
-            identifier_string += self.current_character
-            self.advance()
+        self.index = len(self.text)
+        start_position, end_position = self.source.position(start), self.source.position(self.index)
 
-        token_type = TT_KEYWORD if identifier_string in KEYWORDS else TT_IDENTIFIER
-        return Token(token_type, identifier_string, start_position, self.position)
-    
-    def make_not_equals(self):
-        start_position = self.position.copy()
-        self.advance()
+        if bracket_count == 1:
+            return None, ExpectedCharacterError(start_position, end_position, "'}'")
 
-        if self.current_character == '=':
-            self.advance()
-            return Token(TT_NOT_EQUALS, start_position = start_position, end_position = self.position), None
-        
-        self.advance()
-        return None, ExpectedCharacterError(start_position, self.position, "'=' after '!'")
-    
-    def make_equals(self):
-        token_type = TT_EQUALS
-        start_position = self.position.copy()
+        return None, InvalidSyntaxError(start_position, end_position, "Unterminated text literal")
 
-        self.advance()
+class TokenStream:
+    # Tokens are pulled from the lexer on demand and released once the parser commits past them.
+    # The parser commits at the start of the statement before the one it is parsing and never
+    # reverses further than the start of a failed statement, so released tokens are not read again
+    def __init__(self, tokens, releasing = True):
+        self.tokens = iter(tokens)
+        self.releasing = releasing
+        self.buffer = []
+        self.offset = 0
+        self.exhausted = False
 
-        if self.current_character == '=':
-            self.advance()
-            token_type = TT_DOUBLE_EQUALS
+    @classmethod
+    def from_list(cls, tokens: list[Token]):
+        stream = cls((), False)
+        stream.buffer = tokens
+        stream.exhausted = True
 
-        return Token(token_type, start_position = start_position, end_position = self.position)
-    
-    def make_less_than(self):
-        token_type = TT_LESS_THAN
-        start_position = self.position.copy()
-        
-        self.advance()
+        return stream
 
-        if self.current_character == '=':
-            self.advance()
-            token_type = TT_LESS_THAN_OR_EQUALS
+    def get(self, index: int) -> Token | None:
+        position = index - self.offset
 
-        return Token(token_type, start_position = start_position, end_position = self.position)
-    
-    def make_greater_than(self):
-        token_type = TT_GREATER_THAN
-        start_position = self.position.copy()
+        if 0 <= position < len(self.buffer):
+            return self.buffer[position]
         
-        self.advance()
+        if position < 0:
+            return self.get_released(index)
+        
+        while not self.exhausted and position >= len(self.buffer):
+            token = next(self.tokens, None)
 
-        if self.current_character == '=':
-            self.advance()
-            token_type = TT_GREATER_THAN_OR_EQUALS
+            if token is None: self.exhausted = True
+            else: self.buffer.append(token)
 
-        return Token(token_type, start_position = start_position, end_position = self.position)
-        
-    def make_divide_or_comment(self):
-        start_position = self.position.copy()
-        self.advance()
+        return self.buffer[position] if position < len(self.buffer) else None
+    
+    def get_released(self, index: int) -> Token | None:
+        # Negative indices count from the end of a list of tokens, as they did before streaming
+        if not self.releasing:
+            return self.buffer[index] if index >= -len(self.buffer) else None
 
-        if self.current_character == '/':
-            while self.current_character is not None and not self.current_character in ';\n':
-                self.advance()
+        raise IndexError(f'Token {index} was released, the parser committed at token {self.offset}.')
+    
+    def release(self, index: int):
+        if not self.releasing: return
 
-            return None
-        
-        if self.current_character == '*':
-            while self.current_character is not None:
-                previous_character = self.current_character
-                self.advance()
-                
-                if self.current_character == '/' and previous_character == '*':
-                    self.advance()
-                    break
+        released = index - self.offset
 
-            return None
+        # Only compact once the released tokens outweigh the live ones
+        if released > len(self.buffer) // 2:
+            del self.buffer[:released]
+            self.offset = index
 
-        return Token(TT_DIVIDE, start_position = start_position, end_position = self.position)
+    def drain(self):
+        for _ in self.tokens: pass
+        self.exhausted = True
 
 #endregion
 
@@ -495,9 +508,39 @@ class Lexer:
 #region NODES
 
 class Node:
-    def __init__(self, start_position: Position | None = None, end_position: Position | None = None):
-        self.start_position = start_position
-        self.end_position = end_position
+    __slots__ = ('source', 'start', 'end', 'resolved_start_position', 'resolved_end_position', 'chunk', 'closure')
+
+    def __init__(self, source: SourceFile | None = None, start: int | None = None, end: int | None = None):
+        self.source = source
+        self.start = start
+        self.end = end
+
+        self.resolved_start_position = None
+        self.resolved_end_position = None
+        self.chunk = None
+        self.closure = None
+
+    @property
+    def start_position(self) -> Position | None:
+        if self.resolved_start_position is None and self.source:
+            self.resolved_start_position = self.source.position(self.start)
+
+        return self.resolved_start_position
+    
+    @start_position.setter
+    def start_position(self, position: Position | None):
+        self.resolved_start_position = position
+    
+    @property
+    def end_position(self) -> Position | None:
+        if self.resolved_end_position is None and self.source:
+            self.resolved_end_position = self.source.end_position(self.end)
+
+        return self.resolved_end_position
+    
+    @end_position.setter
+    def end_position(self, position: Position | None):
+        self.resolved_end_position = position
 
     def __repr__(self):
         return f'({self.token})'
@@ -505,26 +548,74 @@ class Node:
 ## Numbers
 
 class NumberNode(Node):
+    __slots__ = ('token',)
+
     def __init__(self, token: Token):
-        super().__init__(token.start_position, token.end_position)
+        super().__init__(token.source, token.start, token.end)
         self.token = token
 
 ## Expressions
 
+BINARY_OPERATIONS = {
+    TT_ADD: 'added_to',
+    TT_SUBTRACT: 'subtracted_by',
+    TT_MULIPLY: 'multiplied_by',
+    TT_DIVIDE: 'divided_by',
+    TT_POWER: 'powered_by',
+    TT_DOUBLE_EQUALS: 'is_equals_to',
+    TT_NOT_EQUALS: 'is_not_equals_to',
+    TT_GREATER_THAN: 'is_greater_than',
+    TT_LESS_THAN: 'is_less_than',
+    TT_GREATER_THAN_OR_EQUALS: 'is_greater_or_equals',
+    TT_LESS_THAN_OR_EQUALS: 'is_less_or_equals',
+    (TT_KEYWORD, 'and'): 'and_',
+    (TT_KEYWORD, 'or'): 'or_'
+}
+
+# Value of the left operand's boolean that decides the result without evaluating the right one
+SHORT_CIRCUIT_OPERATIONS = {
+    'and_': False,
+    'or_': True
+}
+
+# Operations on two numbers that a BinaryOperationNode can be specialized to
+NUMBER_OPERATIONS = {
+    'added_to': operator.add,
+    'subtracted_by': operator.sub,
+    'multiplied_by': operator.mul,
+    'is_equals_to': operator.eq,
+    'is_not_equals_to': operator.ne,
+    'is_greater_than': operator.gt,
+    'is_less_than': operator.lt,
+    'is_greater_or_equals': operator.ge,
+    'is_less_or_equals': operator.le
+}
+
 class BinaryOperationNode(Node):
+    __slots__ = ('left_node', 'operator_token', 'right_node', 'operation', 'short_circuit', 'hits')
+
     def __init__(self, left_node: Node, operator_token: Token, right_node: Node):
-        super().__init__(left_node.start_position, right_node.end_position)
+        super().__init__(left_node.source, left_node.start, right_node.end)
         
         self.left_node = left_node
         self.operator_token = operator_token
         self.right_node = right_node
 
+        # Name of the Value method implementing the operator, bound once when parsing
+        self.operation = BINARY_OPERATIONS.get((operator_token.type, operator_token.value)) or BINARY_OPERATIONS.get(operator_token.type)
+        self.short_circuit = SHORT_CIRCUIT_OPERATIONS.get(self.operation, None)
+
+        # Evaluations on two numbers, None once the node can't be specialized
+        self.hits = 0 if self.operation in NUMBER_OPERATIONS else None
+
     def __repr__(self):
         return f'({self.left_node} {self.operator_token} {self.right_node})'
 
 class UnaryOperationNode(Node):
+    __slots__ = ('operation_token', 'node')
+
     def __init__(self, operation_token: Token, node: Node):
-        super().__init__(operation_token.start_position, node.end_position)
+        super().__init__(operation_token.source, operation_token.start, node.end)
 
         self.operation_token = operation_token
         self.node = node
@@ -535,19 +626,28 @@ class UnaryOperationNode(Node):
 ## Text
 
 class TextNode(Node):
+    __slots__ = ('token',)
+
     def __init__(self, token: Token):
-        super().__init__(token.start_position, token.end_position)
+        super().__init__(token.source, token.start, token.end)
         self.token = token
 
 class CallNode(Node):
+    __slots__ = ('node_to_call', 'argument_nodes', 'built_in_name', 'built_in_cache')
+
     def __init__(self, node_to_call: Node, argument_nodes: list[Node]):
-        super().__init__(node_to_call.start_position, node_to_call.end_position)
+        super().__init__(node_to_call.source, node_to_call.start, node_to_call.end)
 
         self.node_to_call = node_to_call
         self.argument_nodes = argument_nodes
 
+        # Calls like 'print(...)' can use the built-in without looking it up
+        name = variable_name(node_to_call)
+        self.built_in_name = name if name in inlinable_names else None
+        self.built_in_cache = None
+
         if (len(argument_nodes) > 0):
-            self.end_position = argument_nodes[len(argument_nodes) - 1].end_position
+            self.end = argument_nodes[len(argument_nodes) - 1].end
 
     def __repr__(self):
         return f'(CallNode: {self.node_to_call}({", ".join(str(x) for x in self.argument_nodes)}))'
@@ -555,37 +655,60 @@ class CallNode(Node):
 ## Lists
 
 class ListNode(Node):
-    def __init__(self, element_nodes: list[Node], start_position: Position, end_position: Position):
-        super().__init__(start_position, end_position)
+    __slots__ = ('element_nodes',)
+
+    def __init__(self, element_nodes: list[Node], source: SourceFile, start: int, end: int):
+        super().__init__(source, start, end)
         self.element_nodes = element_nodes
 
     def __repr__(self):
         return f'([{", ".join(str(x) for x in self.element_nodes)}])'
 
 class IndexingNode(Node):
+    __slots__ = ('base_node', 'index_node', 'allow_methods', 'method_cache', 'hits')
+
     def __init__(self, base_node: Node, index_node: Node, allow_methods: bool = False):
-        super().__init__(base_node.start_position, index_node.end_position)
+        super().__init__(base_node.source, base_node.start, index_node.end)
 
         self.base_node = base_node
         self.index_node = index_node
         self.allow_methods = allow_methods
+        self.method_cache = None
+
+        # Lists indexed by numbers, None once the node can't be specialized
+        self.hits = None if allow_methods else 0
 
     def __repr__(self):
         return f'({self.base_node}[{self.index_node}])'
 
 class IndexAssignmentNode(Node):
+    __slots__ = ('variable_node', 'indexing_node', 'value_node', 'target_key')
+
     def __init__(self, variable_node: Node, indexing_node: IndexingNode, value_node: Node):
-        super().__init__(indexing_node.start_position, value_node.end_position)
+        super().__init__(indexing_node.source, indexing_node.start, value_node.end)
 
         self.variable_node = variable_node
         self.indexing_node = indexing_node
         self.value_node = value_node
 
+        # Key of the variable when it is the indexed value itself, as in 'list[0] = 1'
+        self.target_key = None
+        base_node = indexing_node.base_node
+
+        if isinstance(base_node, VariableAccessNode) and is_plain_variable(variable_node) and is_plain_variable(base_node.variable_node):
+            if base_node.variable_node.name_key.value == variable_node.name_key.value:
+                self.target_key = variable_node.name_key
+
+def is_plain_variable(node: Node) -> bool:
+    return isinstance(node, VariableNode) and node.scope_node is None and isinstance(node.variable_name_node, TextNode)
+
 ## Dictionaries
 
 class DictionaryNode(Node):
-    def __init__(self, node_dictionary: dict[Node, Node], start_position: Position, end_position: Position):
-        super().__init__(start_position, end_position)
+    __slots__ = ('node_dictionary',)
+
+    def __init__(self, node_dictionary: dict[Node, Node], source: SourceFile, start: int, end: int):
+        super().__init__(source, start, end)
         self.node_dictionary = node_dictionary
 
     def __repr__(self):
@@ -594,33 +717,43 @@ class DictionaryNode(Node):
 ## Variables
 
 class VariableNode(Node):
+    __slots__ = ('variable_name_node', 'scope_node', 'name_key')
+
     def __init__(self, variable_name_node: Node, scope_node: Node | None):
-        super().__init__(variable_name_node.start_position, variable_name_node.end_position)
+        super().__init__(variable_name_node.source, variable_name_node.start, variable_name_node.end)
 
         self.variable_name_node = variable_name_node
         self.scope_node = scope_node
 
-        if scope_node:
-            new_position = scope_node.start_position.copy()
-            new_position.index -= 1
-            new_position.column -= 1
+        # Names written in the source are looked up with one key built here,
+        # only names like '$(expression)' are evaluated on each access
+        self.name_key = Text(intern(variable_name_node.token.value)) if isinstance(variable_name_node, TextNode) else None
 
-            self.start_position = new_position
+        if scope_node:
+            self.start = scope_node.start - 1
 
     def __repr__(self):
         return f'(<{self.scope_node}>{self.variable_name_node})'
 
 class VariableAccessNode(Node):
+    __slots__ = ('variable_node', 'hits', 'name_key')
+
     def __init__(self, variable_node: Node):
-        super().__init__(variable_node.start_position, variable_node.end_position)
+        super().__init__(variable_node.source, variable_node.start, variable_node.end)
         self.variable_node = variable_node
 
+        # Successful reads of a plain name, None once the node can't be specialized
+        self.hits = 0 if is_plain_variable(variable_node) else None
+        self.name_key = variable_node.name_key if self.hits is not None else None
+
     def __repr__(self):
         return f'(VariableAccessNode: {self.variable_node})'
 
 class VariableAssignmentNode(Node):
+    __slots__ = ('variable_node', 'value_node')
+
     def __init__(self, variable_node: Node, value_node: Node):
-        super().__init__(variable_node.start_position, value_node.end_position)
+        super().__init__(variable_node.source, variable_node.start, value_node.end)
 
         self.variable_node = variable_node
         self.value_node = value_node
@@ -629,15 +762,19 @@ class VariableAssignmentNode(Node):
         return f'(VariableAssignmentNode: {self.variable_node} = {self.value_node})'
 
 class GlobalScopeNode(Node):
+    __slots__ = ()
+
     def __init__(self, token: Token):
-        super().__init__(token.start_position, token.end_position)
+        super().__init__(token.source, token.start, token.end)
 
     def __repr__(self):
         return '(GlobalScopeNode)'
     
 class DefaultScopeNode(Node):
+    __slots__ = ()
+
     def __init__(self, token: Token):
-        super().__init__(token.start_position, token.end_position)
+        super().__init__(token.source, token.start, token.end)
 
     def __repr__(self):
         return '(DefaultScopeNode)'
@@ -645,8 +782,10 @@ class DefaultScopeNode(Node):
 ## Null
 
 class NullNode(Node):
-    def __init__(self, start_position: Position, end_position: Position):
-        super().__init__(start_position, end_position)
+    __slots__ = ()
+
+    def __init__(self, source: SourceFile, start: int, end: int):
+        super().__init__(source, start, end)
 
     def __repr__(self):
         return repr(Null())
@@ -654,24 +793,20 @@ class NullNode(Node):
 ## Flow Control
 
 class IfNode(Node):
-    def __init__(self, condition_node: Node, true_node: Node, false_node: Node | None = None):
-        start_position = condition_node.start_position.copy()
-        start_position.index -= 1
-        start_position.column -= 1
+    __slots__ = ('condition_node', 'true_node', 'false_node')
 
-        super().__init__(start_position, true_node.end_position)
+    def __init__(self, condition_node: Node, true_node: Node, false_node: Node | None = None):
+        super().__init__(condition_node.source, condition_node.start - 1, true_node.end)
 
         self.condition_node = condition_node
         self.true_node = true_node
         self.false_node = false_node
 
 class WhileNode(Node):
-    def __init__(self, condition_node: Node, while_node: Node):
-        start_position = condition_node.start_position.copy()
-        start_position.index -= 1
-        start_position.column -= 1
+    __slots__ = ('condition_node', 'while_node')
 
-        super().__init__(start_position, while_node.end_position)
+    def __init__(self, condition_node: Node, while_node: Node):
+        super().__init__(condition_node.source, condition_node.start - 1, while_node.end)
 
         self.condition_node = condition_node
         self.while_node = while_node
@@ -679,15 +814,141 @@ class WhileNode(Node):
 ## General
 
 class ValueNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
-        super().__init__(value.start_position, value.end_position)
+        super().__init__()
+
         self.value = value
+        self.start_position = value.start_position
+        self.end_position = value.end_position
+
+## Optimizer
+
+class ConstantNode(Node):
+    # Literal built once by the optimizer, evaluated as a copy sharing its storage
+    __slots__ = ('value',)
+
+    def __init__(self, value, source: SourceFile, start: int, end: int):
+        super().__init__(source, start, end)
+        self.value = value
+
+    def __repr__(self):
+        return repr(self.value)
+
+class BranchNode(Node):
+    # The branch an IfNode or WhileNode always takes. When guarded, the original
+    # node is evaluated instead once 'true' or 'false' have been rebound
+    __slots__ = ('body_node', 'chained', 'guard_node')
+
+    def __init__(self, node: Node, body_node: Node | None, chained: bool = False, guard_node: Node | None = None):
+        super().__init__(node.source, node.start, node.end)
+
+        self.body_node = body_node
+        self.chained = chained
+        self.guard_node = guard_node
+
+    def __repr__(self):
+        return f'(BRANCH {self.body_node})'
+
+## Quickening
+
+class NumberOperationNode(BinaryOperationNode):
+    # A BinaryOperationNode that has only seen numbers on both sides
+    __slots__ = ()
+
+class ListIndexingNode(IndexingNode):
+    # An IndexingNode that has only seen lists indexed by numbers
+    __slots__ = ()
+
+class NameAccessNode(VariableAccessNode):
+    # A VariableAccessNode whose plain name has always been defined
+    __slots__ = ()
+
+## Superinstructions
+
+# Operations fused into 'name = name <operation> literal' for each literal type
+UPDATE_OPERATIONS = {
+    NumberNode: ('added_to', 'subtracted_by', 'multiplied_by'),
+    TextNode: ('added_to',)
+}
+
+COMPARISON_OPERATIONS = ('is_equals_to', 'is_not_equals_to', 'is_greater_than', 'is_less_than', 'is_greater_or_equals', 'is_less_or_equals')
+
+def variable_name(node: Node) -> str | None:
+    # Name read by a plain variable access like 'i' or '$i'
+    if isinstance(node, VariableAccessNode) and is_plain_variable(node.variable_node):
+        return node.variable_node.variable_name_node.token.value
+    
+    return None
+
+class UpdateVariableNode(VariableAssignmentNode):
+    # 'i = i + 1' or 'x = x + "..."' in one step while the variable holds a
+    # value of the literal's type
+    __slots__ = ('name_key', 'value_type', 'function', 'literal')
+
+    def __init__(self, variable_node: VariableNode, value_node: BinaryOperationNode):
+        super().__init__(variable_node, value_node)
+
+        self.name_key = variable_node.name_key
+        self.value_type = Number if isinstance(value_node.right_node, NumberNode) else Text
+        self.function = operator.add if value_node.operation == 'added_to' else NUMBER_OPERATIONS[value_node.operation]
+        self.literal = value_node.right_node.token.value
+
+class CompareVariableNode(BinaryOperationNode):
+    # 'i < 10' in one step while the variable holds a number
+    __slots__ = ('name_key', 'function', 'literal')
+
+    def __init__(self, left_node: VariableAccessNode, operator_token: Token, right_node: NumberNode):
+        super().__init__(left_node, operator_token, right_node)
+        self.hits = None
+
+        self.name_key = left_node.variable_node.name_key
+        self.function = NUMBER_OPERATIONS[self.operation]
+        self.literal = right_node.token.value
+
+class IndexVariableNode(IndexingNode):
+    # 'list[i]' in one step while the variables hold a list and a number within it
+    __slots__ = ('base_key', 'index_key')
+
+    def __init__(self, base_node: VariableAccessNode, index_node: VariableAccessNode):
+        super().__init__(base_node, index_node)
+        self.hits = None
+
+        self.base_key = base_node.variable_node.name_key
+        self.index_key = index_node.variable_node.name_key
+
+def fused_assignment(variable_node: Node, value_node: Node) -> VariableAssignmentNode:
+    if (
+        is_plain_variable(variable_node) and isinstance(value_node, BinaryOperationNode) and
+        variable_name(value_node.left_node) == variable_node.variable_name_node.token.value and
+        value_node.operation in UPDATE_OPERATIONS.get(type(value_node.right_node), ())
+    ):
+        return UpdateVariableNode(variable_node, value_node)
+    
+    return VariableAssignmentNode(variable_node, value_node)
+
+def fused_binary_operation(left_node: Node, operator_token: Token, right_node: Node) -> BinaryOperationNode:
+    node = BinaryOperationNode(left_node, operator_token, right_node)
+
+    if node.operation in COMPARISON_OPERATIONS and variable_name(left_node) is not None and type(right_node) is NumberNode:
+        return CompareVariableNode(left_node, operator_token, right_node)
+    
+    return node
+
+def fused_indexing(base_node: Node, index_node: Node) -> IndexingNode:
+    if variable_name(base_node) is not None and variable_name(index_node) is not None:
+        return IndexVariableNode(base_node, index_node)
+    
+    return IndexingNode(base_node, index_node)
 
 #endregion
 
 #region PARSE RESULT
 
 class ParseResult:
+    __slots__ = ('error', 'node', 'advance_count', 'to_reverse_count')
+
     def __init__(self):
         self.error = None
         self.node = None
@@ -724,17 +985,50 @@ class ParseResult:
 
 #region PARSER
 
+def memoize(rule):
+    # Rules only depend on the current token and on the last postfix flag read by index()
+    def memoized_rule(self):
+        memo = self.memo.get(self.current_token_index, None)
+        if memo is None: memo = self.memo[self.current_token_index] = {}
+
+        key = (rule, self.last_postfix_is_index)
+        entry = memo.get(key, None)
+
+        if entry is not None:
+            result, self.current_token_index, self.last_postfix_is_index = entry
+            self.solve_current_token()
+
+            return result
+
+        result = rule(self)
+        memo[key] = (result, self.current_token_index, self.last_postfix_is_index)
+
+        return result
+
+    memoized_rule.__name__ = rule.__name__
+    return memoized_rule
+
 class Parser:
-    def __init__(self, tokens: list[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: list[Token] | TokenStream):
+        self.tokens = tokens if isinstance(tokens, TokenStream) else TokenStream.from_list(tokens)
         self.current_token_index = 0
         self.solve_current_token()
 
         self.last_postfix_is_index = False
+        self.memo = {}
+        self.committed_index = 0
 
     def solve_current_token(self):
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]
+        token = self.tokens.get(self.current_token_index)
+        if token is not None: self.current_token = token
+    
+    def commit(self, index: int):
+        # Frees the tokens and memoized results before index
+        for memo_index in range(self.committed_index, index):
+            self.memo.pop(memo_index, None)
+
+        self.committed_index = max(self.committed_index, index)
+        self.tokens.release(self.committed_index)
         
     def advance(self):
         self.current_token_index += 1
@@ -763,6 +1057,7 @@ class Parser:
     
     ## Variables
 
+    @memoize
     def variable(self):
         result = ParseResult()
         token = self.current_token
@@ -835,6 +1130,7 @@ class Parser:
             "Expected identifier, '<' or '$'"
         ))
 
+    @memoize
     def index(self):
         result = ParseResult()
         starting_token = self.current_token_index
@@ -859,6 +1155,7 @@ class Parser:
 
     ## Binary Operations
 
+    @memoize
     def baseAtom(self):
         result = ParseResult()
         token = self.current_token
@@ -922,6 +1219,7 @@ class Parser:
             "Expected a number, a variable, '+', '-', '(' or '['"
         ))
 
+    @memoize
     def atom(self):
         result = ParseResult()
 
@@ -984,7 +1282,7 @@ class Parser:
                 result.register_advancement()
                 self.advance()
                 
-                currentNode = IndexingNode(currentNode, index)
+                currentNode = fused_indexing(currentNode, index)
                 self.last_postfix_is_index = True
 
             if self.current_token.type == TT_DOT:
@@ -1007,16 +1305,17 @@ class Parser:
 
         return result.success(currentNode)
 
+    @memoize
     def list_expression(self):
         result = ParseResult()
         element_nodes = []
 
         token = self.current_token
-        start_position = token.start_position.copy()
+        start_token = token
 
         if token.type != TT_OPEN_BRACKETS:
             return result.failure(InvalidSyntaxError(
-                start_position, self.current_token.end_position,
+                token.start_position, self.current_token.end_position,
                 "Expected '['"
             ))
         
@@ -1071,10 +1370,11 @@ class Parser:
 
         return result.success(ListNode(
             element_nodes,
-            start_position,
-            self.current_token.end_position.copy()
+            start_token.source, start_token.start,
+            self.current_token.end
         ))
 
+    @memoize
     def dictionary_element(self):
         result = ParseResult()
 
@@ -1109,16 +1409,17 @@ class Parser:
         value = result.register(self.expression())
         return result.success((key, value))
 
+    @memoize
     def dictionary_expression(self):
         result = ParseResult()
         node_dictionary = {}
     
         token = self.current_token
-        start_position = token.start_position.copy()
+        start_token = token
 
         if token.type != TT_PIPE:
             return result.failure(InvalidSyntaxError(
-                start_position, token.end_position,
+                token.start_position, token.end_position,
                 "Expected '|'"
             ))
         
@@ -1164,13 +1465,15 @@ class Parser:
 
         return result.success(DictionaryNode(
             node_dictionary,
-            start_position,
-            self.current_token.end_position.copy()
+            start_token.source, start_token.start,
+            self.current_token.end
         ))
 
+    @memoize
     def power(self):
         return self.binary_operation(self.atom, (TT_POWER, ), self.factor)
 
+    @memoize
     def factor(self):
         result = ParseResult()
         token = self.current_token
@@ -1186,9 +1489,11 @@ class Parser:
         
         return self.power()
 
+    @memoize
     def term(self):
         return self.binary_operation(self.factor, (TT_MULIPLY, TT_DIVIDE))
     
+    @memoize
     def if_expression(self):
         result = ParseResult()
 
@@ -1275,6 +1580,7 @@ class Parser:
         
         return result.success(IfNode(expression, atom))
     
+    @memoize
     def while_expression(self):
         result = ParseResult()
 
@@ -1327,9 +1633,11 @@ class Parser:
         
         return result.success(WhileNode(expression, atom))
         
+    @memoize
     def arithmetic_expression(self):
         return self.binary_operation(self.term, (TT_ADD, TT_SUBTRACT))
     
+    @memoize
     def comparaison_expression(self):
         result = ParseResult()
         token = self.current_token
@@ -1356,6 +1664,7 @@ class Parser:
         
         return result.success(node)
 
+    @memoize
     def expression(self):
         result = ParseResult()
 
@@ -1378,7 +1687,7 @@ class Parser:
                 expression = result.register(self.expression())
 
                 if result.error: return result
-                return result.success(VariableAssignmentNode(variable.node, expression))
+                return result.success(fused_assignment(variable.node, expression))
         
         self.current_token_index = starting_index
         self.solve_current_token()
@@ -1416,18 +1725,22 @@ class Parser:
         result = ParseResult()
         statements = []
 
-        start_position = self.current_token.start_position.copy()
+        start_token = self.current_token
 
         while self.current_token.type == TT_NEW_LINE:
             result.register_advancement()
             self.advance()
 
         if self.current_token.type == TT_EOF:
+            token = self.current_token
+
             return result.success(ListNode(
-                [NullNode(self.current_token.start_position, self.current_token.end_position)],
-                self.current_token.start_position, self.current_token.end_position
+                [NullNode(token.source, token.start, token.end)],
+                token.source, token.start, token.end
             ))
 
+        previous_start = self.current_token_index
+
         statement = result.register(self.expression())
         if result.error: return result
 
@@ -1449,6 +1762,7 @@ class Parser:
 
             if not more_statements: break
 
+            statement_start = self.current_token_index
             statement = result.try_register(self.expression())
 
             if not statement:
@@ -1459,10 +1773,14 @@ class Parser:
 
             statements.append(statement)
 
+            # A failed statement may still reverse into the previous one
+            self.commit(previous_start)
+            previous_start = statement_start
+
         return result.success(ListNode(
             statements,
-            start_position,
-            self.current_token.start_position.copy()
+            start_token.source, start_token.start,
+            self.current_token.start
         ))
     
     def binary_operation(self, left_function, operation_tokens: tuple, right_function = None):
@@ -1480,7 +1798,7 @@ class Parser:
             right = result.register(right_function() if right_function else left_function())
             if result.error: return result
 
-            left = BinaryOperationNode(left, token, right) # type: ignore
+            left = fused_binary_operation(left, token, right) # type: ignore
 
         return result.success(left)
 
@@ -1490,6 +1808,8 @@ class Parser:
 #region RUNTIME RESULT
 
 class RuntimeResult:
+    __slots__ = ('value', 'error')
+
     def __init__(self):
         self.value = None
         self.error = None
@@ -1506,6 +1826,16 @@ class RuntimeResult:
         self.error = error
         return self
 
+class RuntimeFailure(Exception):
+    # Unwinds a failed evaluation inside an engine, converted back to a RuntimeResult at its boundary
+    def __init__(self, error):
+        super().__init__(error)
+        self.error = error
+
+def unwrap(result: RuntimeResult):
+    if result.error: raise RuntimeFailure(result.error)
+    return result.value
+
 #endregion
 
 #region VALUES
@@ -1546,20 +1876,88 @@ def get_object_from_value(value):
     else:
         return None
 
+# Values compare by content so they can be Dictionary keys, '==' and the List methods
+# compare raw values instead, where the contents of lists and dictionaries are compared
+# by identity: separately built containers are never equal. Interned values are shared
+# by unrelated containers, so they never count as the same element
+
+def same_element(element, other) -> bool:
+    return element is other and not element.interned
+
+def same_raw_value(value, other) -> bool:
+    if type(value) is list:
+        return type(other) is list and len(value) == len(other) and all(map(same_element, value, other))
+    
+    if type(value) is dict:
+        if type(other) is not dict or len(value) != len(other): return False
+
+        elements = { id(key): element for key, element in other.items() }
+        return all(same_element(elements.get(id(key), None), element) for key, element in value.items())
+    
+    return value == other
+
+def same_container(value, other) -> bool:
+    # Copies sharing storage are the same list or dictionary
+    return value is other or (value.holders is not None and value.holders is other.holders)
+
+def same_value(value, other) -> bool:
+    if isinstance(value, (List, Dictionary)) and type(other) is type(value) and same_container(value, other): return True
+    return same_raw_value(value.value, other.value)
+
+def value_index(values: list, value) -> int:
+    for index, element in enumerate(values):
+        if same_value(element, value): return index
+
+    return -1
+
+# Copies of a List or Dictionary share their storage until one of them is mutated.
+# 'holders' counts the values using the storage and is shared between all of them,
+# None while a value has never been copied
+
+def share_storage(value, copy):
+    # Interned containers keep their storage for good, each copy is a new value that
+    # counts them as a holder
+    if value.interned:
+        copy.holders = [2]
+        return
+
+    if value.holders is None: value.holders = [1]
+
+    value.holders[0] += 1
+    copy.holders = value.holders
+
+def release_storage(value):
+    if value.holders is not None: value.holders[0] -= 1
+    value.holders = None
+
+def is_storage_shared(value) -> bool:
+    # A copy is only needed while another value still holds the storage
+    return value.holders is not None and value.holders[0] > 1
+
 
 class Value(ABC):
+    __slots__ = ('value', 'start_position', 'end_position', 'context', 'interned')
+
     def __init__(self, value):
         self.value = value
-        self.set_position()
-        self.set_context()
+        self.start_position = None
+        self.end_position = None
+        self.context = None
+        self.interned = False
 
     def set_position(self, start_position = None, end_position = None):
+        # Interned values are shared and keep no position or context, the engines
+        # position a copy where an operation on one can report an error
+        if self.interned: return self
+
         self.start_position = start_position
         self.end_position = end_position
 
         return self
     
     def set_context(self, context = None):
+        if self.interned: return self
+
         self.context = context
         return self
     
@@ -1567,6 +1965,10 @@ class Value(ABC):
     def copy(self):
         pass
 
+    def frozen(self):
+        # Form of the value stored as a dictionary key, must not change afterwards
+        return self
+
     ## Execute
 
     @abstractmethod
@@ -1674,9 +2076,9 @@ class Value(ABC):
         if result.error: return result
 
         if self_boolean.value and other_boolean.value:
-            return result.success(Number(1))
+            return result.success(TRUE)
         else:
-            return result.success(Number(0))
+            return result.success(FALSE)
     
     @abstractmethod
     def or_(self, other) -> RuntimeResult:
@@ -1689,9 +2091,9 @@ class Value(ABC):
         if result.error: return result
 
         if self_boolean.value or other_boolean.value:
-            return result.success(Number(1))
+            return result.success(TRUE)
         else:
-            return result.success(Number(0))
+            return result.success(FALSE)
 
     @abstractmethod
     def not_(self) -> RuntimeResult:
@@ -1701,9 +2103,9 @@ class Value(ABC):
         if result.error: return result
 
         if boolean.value == 1:
-            return result.success(Number(0))
+            return result.success(FALSE)
         else:
-            return result.success(Number(1))
+            return result.success(TRUE)
 
     ## Conversion
 
@@ -1729,6 +2131,8 @@ class Value(ABC):
 
 
 class Number(Value):
+    __slots__ = ()
+
     def __init__(self, value: float):
         super().__init__(float(value))
 
@@ -1751,6 +2155,14 @@ class Number(Value):
     def __repr__(self) -> str:
         return str(self)
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Number) and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
     ## Execute
 
     def execute(self, arguments: list[Value]) -> RuntimeResult:
@@ -1866,11 +2278,11 @@ class Number(Value):
         result = RuntimeResult()
 
         if isinstance(other, Number):
-            return result.success(Number(self.value == other.value)
+            return result.success(boolean_value(self.value == other.value)
                 .set_context(self.context)\
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)\
             .set_position(self.start_position, other.end_position))
     
@@ -1881,7 +2293,7 @@ class Number(Value):
         result = RuntimeResult()
 
         if isinstance(other, Number):
-            return result.success(Number(self.value > other.value)
+            return result.success(boolean_value(self.value > other.value)
                 .set_context(self.context)\
                 .set_position(self.start_position, other.end_position))
 
@@ -1895,7 +2307,7 @@ class Number(Value):
         result = RuntimeResult()
 
         if isinstance(other, Number):
-            return result.success(Number(self.value < other.value)
+            return result.success(boolean_value(self.value < other.value)
                 .set_context(self.context)\
                 .set_position(self.start_position, other.end_position))
 
@@ -1928,9 +2340,9 @@ class Number(Value):
         result = RuntimeResult()
 
         if self.value > 0:
-            return result.success(Number(1))
+            return result.success(TRUE)
         else:
-            return result.success(Number(0))
+            return result.success(FALSE)
         
     def to_number(self) -> RuntimeResult:
         return RuntimeResult().success(self)
@@ -1950,6 +2362,8 @@ class Number(Value):
 
 
 class Text(Value):
+    __slots__ = ('base_value',)
+
     def __init__(self, value: str):
         super().__init__(value)
         self.base_value = None
@@ -1968,29 +2382,48 @@ class Text(Value):
 
         return copy
     
+    def bind(self, base_value: Value):
+        bound = self.copy()
+        bound.base_value = base_value
+
+        return bound
+    
     def __str__(self) -> str:
         return self.value
     
     def __repr__(self) -> str:
         return f'"{self.value}"'
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Text) and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
     ## Execute
-    def execute(self, arguments: list[Value]) -> RuntimeResult:
-        result = RuntimeResult()
+    def new_context(self, arguments: list[Value], start_position: Position) -> 'Context':
+        new_context = Context('Text', self.context, start_position)
+        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
 
-        if self.base_value is not None:
-            arguments.insert(0, self.base_value)
+        # The 'arguments' list is only built if the body reads it
+        new_context.symbol_table.symbols['arguments'] = LazyArguments(arguments, self.base_value, new_context)
 
-        new_context = Context('Text', self.context, self.start_position)
-        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+        return new_context
 
-        argument_list = List(arguments).set_context(new_context)
-        new_context.symbol_table.set(Text("arguments"), argument_list)
-            
-        value, error = run('Text', self.value, new_context)
+    def execute(self, arguments: list[Value], start_position: Position | None = None, end_position: Position | None = None) -> RuntimeResult:
+        result = RuntimeResult()
 
-        if error:
-            return result.failure(error)
+        new_context = self.new_context(arguments, self.start_position if start_position is None else start_position)
+
+        # Parsed and run without going through run(), every call nests these
+        # frames on the Python stack
+        ast, error = parse('Text', self.value)
+        if error: return result.failure(error)
+
+        value = result.register(interpret_ast(ast, new_context))
+        if result.error: return result
 
         return_value = value.value[len(value.value) - 1]
         return result.success(return_value)
@@ -2141,11 +2574,11 @@ class Text(Value):
         result = RuntimeResult()
 
         if isinstance(other, Text):
-            return result.success(Number(self.value == other.value)
+            return result.success(boolean_value(self.value == other.value)
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)
             .set_position(self.start_position, other.end_position))
     
@@ -2198,7 +2631,7 @@ class Text(Value):
     
     ## Conversion
     def to_boolean(self) -> RuntimeResult:
-        return RuntimeResult().success(Number(not (self.value.strip() == '')))
+        return RuntimeResult().success(boolean_value(not (self.value.strip() == '')))
     
     def to_number(self) -> RuntimeResult:
         result = RuntimeResult()
@@ -2232,8 +2665,14 @@ class Text(Value):
 
 
 class List(Value):
+    __slots__ = ('holders', 'owned')
+
     def __init__(self, value: list):
         super().__init__(value)
+        self.holders = None
+
+        # Set while a single variable binding is the only reference to this value
+        self.owned = False
 
     def set_position(self, start_position = None, end_position = None):
         return super().set_position(start_position, end_position)
@@ -2242,18 +2681,45 @@ class List(Value):
         return super().set_context(context)
     
     def copy(self):
-        copy = List(self.value[:])
+        copy = List(self.value)
         copy.set_position(self.start_position, self.end_position)
         copy.set_context(self.context)
 
+        share_storage(self, copy)
         return copy
     
+    def detach(self):
+        if is_storage_shared(self):
+            release_storage(self)
+            self.value = self.value[:]
+
+        return self
+    
+    def __del__(self):
+        # The slot is unset when __init__ was interrupted, by a RecursionError for one
+        if getattr(self, 'holders', None) is not None: release_storage(self)
+    
     def __str__(self) -> str:
         return f"[{', '.join(str(x) for x in self.value)}]"
     
     def __repr__(self) -> str:
         return f"[{', '.join(repr(x) for x in self.value)}]"
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, List) and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(tuple(self.value))
+    
+    def frozen(self):
+        frozen = List([element.frozen() for element in self.value])
+        frozen.set_position(self.start_position, self.end_position)
+        frozen.set_context(self.context)
+
+        return frozen
+    
     ## Execute
 
     def execute(self, arguments: list[Value]) -> RuntimeResult:
@@ -2290,7 +2756,12 @@ class List(Value):
                     self.context
                 ))
 
-            return result.success(self.value[int(other.value)]
+            element = self.value[int(other.value)]
+
+            # Interned elements are shared, the read positions a copy
+            if element.interned: element = element.copy()
+
+            return result.success(element
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
@@ -2325,6 +2796,7 @@ class List(Value):
                     self.context
                 ))
             
+            self.detach()
             self.value[int(index.value)] = value
 
             return result.success(self.copy()
@@ -2414,11 +2886,11 @@ class List(Value):
         result = RuntimeResult()
 
         if isinstance(other, List):
-            return result.success(Number(self.value == other.value)
+            return result.success(boolean_value(same_container(self, other) or same_raw_value(self.value, other.value))
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)
             .set_position(self.start_position, other.end_position))
     
@@ -2473,10 +2945,10 @@ class List(Value):
     ## Conversion
 
     def to_boolean(self) ->  RuntimeResult:
-        return RuntimeResult().success(Number(len(self.value) > 0))
+        return RuntimeResult().success(boolean_value(len(self.value) > 0))
     
     def to_number(self) ->  RuntimeResult:
-        return RuntimeResult().success(Number(len(self.value)))
+        return RuntimeResult().success(number_value(len(self.value)))
 
     def to_text(self) ->  RuntimeResult:
         return RuntimeResult().success(Text(repr(self)))
@@ -2493,8 +2965,14 @@ class List(Value):
 
 
 class Dictionary(Value):
+    __slots__ = ('holders', 'owned')
+
     def __init__(self, value: dict):
         super().__init__(value)
+        self.holders = None
+
+        # Set while a single variable binding is the only reference to this value
+        self.owned = False
 
     def set_position(self, start_position = None, end_position = None):
         return super().set_position(start_position, end_position)
@@ -2503,18 +2981,45 @@ class Dictionary(Value):
         return super().set_context(context)
     
     def copy(self):
-        copy = Dictionary(self.value.copy())
+        copy = Dictionary(self.value)
         copy.set_position(self.start_position, self.end_position)
         copy.set_context(self.context)
 
+        share_storage(self, copy)
         return copy
     
+    def detach(self):
+        if is_storage_shared(self):
+            release_storage(self)
+            self.value = self.value.copy()
+
+        return self
+    
+    def __del__(self):
+        # The slot is unset when __init__ was interrupted, by a RecursionError for one
+        if getattr(self, 'holders', None) is not None: release_storage(self)
+    
     def __str__(self) -> str:
         return f'|{str(self.value).removeprefix("{").removesuffix("}")}|'
     
     def __repr__(self) -> str:
         return f'|{repr(self.value).removeprefix("{").removesuffix("}")}|'
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Dictionary) and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(frozenset(self.value.items()))
+    
+    def frozen(self):
+        frozen = Dictionary({ key: value.frozen() for key, value in self.value.items() })
+        frozen.set_position(self.start_position, self.end_position)
+        frozen.set_context(self.context)
+
+        return frozen
+    
     ## Execute
 
     def execute(self, arguments: list[Value]) -> RuntimeResult:
@@ -2528,13 +3033,12 @@ class Dictionary(Value):
 
     def index(self, other: Value) -> RuntimeResult:
         result = RuntimeResult()
+        value = self.value.get(other, None)
 
-        keys = map(lambda e: e.value, list(self.value.keys()))
-        values = list(self.value.values())
-        dictionary = dict(zip(keys, values))
+        if value is not None:
+            if value.interned: value = value.copy()
 
-        if other.value in dictionary:
-            return result.success(dictionary[other.value]
+            return result.success(value
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
@@ -2547,15 +3051,8 @@ class Dictionary(Value):
     def assign_index(self, index: Value, value: Value) -> RuntimeResult:
         result = RuntimeResult()
 
-        for k, v in self.value.items():
-            if k.value == index.value:
-                self.value[k] = value
-
-                return result.success(self.copy()
-                    .set_context(self.context)
-                    .set_position(self.start_position, index.end_position))
-        
-        self.value[index] = value
+        self.detach()
+        self.value[index.frozen()] = value
 
         return result.success(self.copy()
             .set_context(self.context)
@@ -2567,7 +3064,7 @@ class Dictionary(Value):
         result = RuntimeResult()
         
         if isinstance(other, Dictionary):
-            new_dictionary = self.copy()
+            new_dictionary = self.copy().detach()
             new_dictionary.value.update(other.value)
 
             return result.success(new_dictionary)
@@ -2582,15 +3079,11 @@ class Dictionary(Value):
 
     def subtracted_by(self, other: Value) -> RuntimeResult:
         result = RuntimeResult()
-        new_dictionary = self.copy()
+        new_dictionary = self.copy().detach()
         
         if isinstance(other, Dictionary):
-            keys = map(lambda e: e.value, list(other.value.keys()))
-            values = map(lambda e: e.value, list(other.value.values()))
-            other_dictionary = dict(zip(keys, values))
-
-            for key, value in new_dictionary.value.copy().items():
-                if key.value in other_dictionary and other_dictionary[key.value] == value.value:
+            for key, value in other.value.items():
+                if new_dictionary.value.get(key, None) == value:
                     del new_dictionary.value[key]
 
             return result.success(new_dictionary)
@@ -2628,19 +3121,17 @@ class Dictionary(Value):
         result = RuntimeResult()
 
         if isinstance(other, Dictionary):
-            self_keys = map(lambda e: e.value, list(self.value.keys()))
-            self_values =  map(lambda e: e.value, list(self.value.values()))
-            self_dictionary = dict(zip(self_keys, self_values))
-
-            other_keys = map(lambda e: e.value, list(other.value.keys()))
-            other_values =  map(lambda e: e.value, list(other.value.values()))
-            other_dictionary = dict(zip(other_keys, other_values))
+            other_values = other.value
+            is_equals = same_container(self, other) or len(self.value) == len(other_values) and all(
+                key in other_values and same_value(value, other_values[key])
+                for key, value in self.value.items()
+            )
 
-            return result.success(Number(self_dictionary == other_dictionary)
+            return result.success(boolean_value(is_equals)
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)
             .set_position(self.start_position, other.end_position))
     
@@ -2695,10 +3186,10 @@ class Dictionary(Value):
     ## Conversion
 
     def to_boolean(self) -> RuntimeResult:
-        return RuntimeResult().success(Number(len(self.value) > 0))
+        return RuntimeResult().success(boolean_value(len(self.value) > 0))
     
     def to_number(self) -> RuntimeResult:
-        return RuntimeResult().success(Number(len(self.value)))
+        return RuntimeResult().success(number_value(len(self.value)))
 
     def to_text(self) -> RuntimeResult:
         return RuntimeResult().success(Text(repr(self)))
@@ -2719,6 +3210,8 @@ class Dictionary(Value):
 
 
 class Null(Value):
+    __slots__ = ()
+
     def __init__(self, value = None):
         super().__init__(None)
 
@@ -2741,6 +3234,14 @@ class Null(Value):
     def __repr__(self) -> str:
         return str(self)
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Null)
+    
+    def __hash__(self) -> int:
+        return hash(None)
+    
     ## Execute
 
     def execute(self, arguments: list[Value]) -> RuntimeResult:
@@ -2812,11 +3313,11 @@ class Null(Value):
         result = RuntimeResult()
 
         if isinstance(other, Null):
-            return result.success(Number(1)
+            return result.success(TRUE
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)
             .set_position(self.start_position, other.end_position))
     
@@ -2857,10 +3358,10 @@ class Null(Value):
     ## Conversion
 
     def to_boolean(self) -> RuntimeResult:
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(FALSE)
     
     def to_number(self) -> RuntimeResult:
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(number_value(0))
 
     def to_text(self) -> RuntimeResult:
         return RuntimeResult().success(Text(str(self)))
@@ -2876,14 +3377,18 @@ class Null(Value):
         ))
 
 
+# Name of each built-in function, filled in once 'built_ins' is defined
+built_in_names = {}
+
 class BuiltIn(Value):
+    __slots__ = ('base_value', 'name')
+
     def __init__(self, value):
         super().__init__(value)
 
         self.base_value = None
 
-        try: self.name = [key for key, value in built_ins.items() if value == self.value][0]
-        except: self.name = None
+        self.name = built_in_names.get(value, None)
 
     def set_position(self, start_position = None, end_position = None):
         return super().set_position(start_position, end_position)
@@ -2899,25 +3404,41 @@ class BuiltIn(Value):
 
         return copy
     
+    def bind(self, base_value: Value):
+        bound = self.copy()
+        bound.base_value = base_value
+
+        return bound
+    
     def __str__(self) -> str:
         return f'BuiltIn{f": {self.name}" if self.name is not None else ""}'
 
     def __repr__(self) -> str:
         return str(self)
     
+    ## Hashing
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BuiltIn) and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
     ## Execute
 
-    def execute(self, arguments: list[Value]) -> RuntimeResult:
+    def execute(self, arguments: list[Value], start_position: Position | None = None, end_position: Position | None = None) -> RuntimeResult:
         result = RuntimeResult()
 
+        if start_position is None: start_position, end_position = self.start_position, self.end_position
+
         if self.base_value is None:
-            value = result.register(self.value(self.context, self.start_position, self.end_position, *arguments))
+            value = result.register(self.value(self.context, start_position, end_position, *arguments))
         else:
-            value = result.register(self.value(self.context, self.start_position, self.end_position, self.base_value, *arguments))
+            value = result.register(self.value(self.context, start_position, end_position, self.base_value, *arguments))
 
         if result.error: return result
 
-        return result.success(value.set_context(self.context).set_position(self.start_position, self.end_position))
+        return result.success(value.set_context(self.context).set_position(start_position, end_position))
 
     ## Index
 
@@ -2978,11 +3499,11 @@ class BuiltIn(Value):
         result = RuntimeResult()
 
         if isinstance(other, BuiltIn):
-            return result.success(Number(self.value == other.value)
+            return result.success(boolean_value(self.value == other.value)
                 .set_context(self.context)
                 .set_position(self.start_position, other.end_position))
 
-        return result.success(Number(0)
+        return result.success(FALSE
             .set_context(self.context)
             .set_position(self.start_position, other.end_position))
     
@@ -3045,11 +3566,38 @@ class BuiltIn(Value):
     def to_built_in(self) -> RuntimeResult:
         return RuntimeResult().success(self)
 
+## Interned values
+
+SMALL_NUMBER_MIN = -5
+SMALL_NUMBER_MAX = 1024
+
+def interned(value: Value) -> Value:
+    value.interned = True
+    return value
+
+TRUE = interned(Number(1))
+FALSE = interned(Number(0))
+NULL = interned(Null())
+
+SMALL_NUMBERS = [interned(Number(integer)) for integer in range(SMALL_NUMBER_MIN, SMALL_NUMBER_MAX + 1)]
+
+def boolean_value(condition) -> Number:
+    return TRUE if condition else FALSE
+
+def number_value(value) -> Number:
+    # Small integers such as counters and lengths share one interned value each
+    if SMALL_NUMBER_MIN <= value <= SMALL_NUMBER_MAX and value == int(value):
+        return SMALL_NUMBERS[int(value) - SMALL_NUMBER_MIN]
+    
+    return Number(value)
+
 #endregion
 
 #region CONTEXT
 
 class Context:
+    __slots__ = ('display_name', 'parent', 'parent_entry_position', 'symbol_table')
+
     def __init__(self, display_name, parent = None, parent_entry_position = None):
         self.display_name = display_name
         self.parent = parent
@@ -3060,32 +3608,132 @@ class Context:
 
 #region SYMBOL TABLE
 
+BOOLEAN_NAMES = frozenset(('true', 'false'))
+
+def is_method_name(name) -> bool:
+    return isinstance(name, str) and '~' in name
+
+class LazyArguments:
+    # Stands in for the 'arguments' of a Text call until it is read
+    __slots__ = ('values', 'base_value', 'context')
+
+    def __init__(self, values: list[Value], base_value: Value | None, context: Context):
+        self.values = values
+        self.base_value = base_value
+        self.context = context
+
+    def materialize(self) -> List:
+        values = self.values if self.base_value is None else [self.base_value, *self.values]
+        return List(values).set_context(self.context)
+
+# Names of the built-in functions call sites can inline, filled in once 'built_ins' is defined
+inlinable_names = set()
+
 class SymbolTable:
+    __slots__ = ('symbols', 'parent', 'root', 'version', 'shadowed_names', '__weakref__')
+
+    # Bumped whenever a 'Type~method' binding changes in any table
+    method_version = 0
+
+    # Bumped whenever 'true' or 'false' is bound in any table
+    boolean_version = 0
+
     def __init__(self, parent = None):
         self.symbols = {}
         self.parent = parent
+        self.root = self if parent is None else parent.root
+
+        # Bumped whenever the name of a built-in is bound or removed in this table
+        self.version = 0
+
+        # In a root, the built-in and 'Type~method' names bound in the tables below it
+        # with the number of live tables binding each, reads of these names may not
+        # resolve to the root. Below a root, the names this table is counted for
+        self.shadowed_names = {} if parent is None else None
 
     def copy(self):
         copy = SymbolTable()
         copy.symbols = self.symbols.copy()
         copy.parent = self.parent
+        copy.root = copy if self.parent is None else self.parent.root
+
+        if self.parent is not None:
+            copy.shadowed_names = None
+            for name in self.shadowed_names or (): copy.shadow(name)
         
         return copy
 
-    def get(self, key: Value, explicit: bool = False):
-        value = self.symbols.get(key.value, None)
+    def shadow(self, name: str):
+        if self.shadowed_names is None:
+            self.shadowed_names = set()
+
+            # The names stop being shadowed once this table is freed
+            weakref.finalize(self, self.root.unshadow, self.shadowed_names)
+
+        if name in self.shadowed_names: return
+        self.shadowed_names.add(name)
+
+        counts = self.root.shadowed_names
+        counts[name] = counts.get(name, 0) + 1
 
-        if (not explicit) and (value is None) and isinstance(self.parent, SymbolTable):
-            return self.parent.get(key, explicit)
+    def unshadow(self, names):
+        counts = self.shadowed_names
+
+        for name in names:
+            counts[name] -= 1
+            if counts[name] == 0: del counts[name]
+
+    def get(self, key: Value, explicit: bool = False):
+        name = key.value
+        table = self
+        value = table.symbols.get(name, None)
+
+        # Walk the chain in a loop so lookups don't grow the Python stack
+        if not explicit:
+            while value is None and table.parent is not None:
+                table = table.parent
+                value = table.symbols.get(name, None)
         
+        if type(value) is LazyArguments:
+            value = table.symbols[name] = value.materialize()
+
         return value
     
     def set(self, key: Value, value: Value):
         self.symbols[key.value] = value
 
+        if is_method_name(key.value):
+            SymbolTable.method_version += 1
+            if self.parent is not None: self.shadow(key.value)
+
+        elif key.value in BOOLEAN_NAMES: SymbolTable.boolean_version += 1
+        elif key.value in inlinable_names:
+            self.version += 1
+            if self.parent is not None: self.shadow(key.value)
+
+    def get_owned(self, key: Value):
+        # Only returns the container if this binding is the only reference to it
+        value = self.symbols.get(key.value, None)
+        return value if isinstance(value, (List, Dictionary)) and value.owned else None
+
     def remove(self, key: Value):
         del self.symbols[key.value]
 
+        if is_method_name(key.value):
+            SymbolTable.method_version += 1
+            self.release_shadow(key.value)
+
+        elif key.value in BOOLEAN_NAMES: SymbolTable.boolean_version += 1
+        elif key.value in inlinable_names:
+            self.version += 1
+            self.release_shadow(key.value)
+
+    def release_shadow(self, name: str):
+        if self.parent is None or self.shadowed_names is None or name not in self.shadowed_names: return
+
+        self.shadowed_names.remove(name)
+        self.root.unshadow((name,))
+
 #endregion
 
 #region DEFAULT CONTEXT
@@ -3099,9 +3747,14 @@ global_symbol_table = SymbolTable()
 
 ## Default variables
 
-default_symbol_table.set(Text('true'), Number(1))
-default_symbol_table.set(Text('false'), Number(0))
-default_symbol_table.set(Text('null'), Null())
+default_symbol_table.set(Text('true'), TRUE)
+default_symbol_table.set(Text('false'), FALSE)
+default_symbol_table.set(Text('null'), NULL)
+
+DEFAULT_BOOLEAN_VERSION = SymbolTable.boolean_version
+
+def booleans_are_default() -> bool:
+    return SymbolTable.boolean_version == DEFAULT_BOOLEAN_VERSION
 
 # AI
 
@@ -3347,6 +4000,7 @@ When a text object is executed, a new scope is created for its variables. Variab
 
 -   `true` and `false` are variables with the default values of 1 and 0 respectivelly
 -   **Boolean operators:** `and`, `or`, `not`
+-   `and` and `or` only evaluate their right side when the left side doesn't decide the result
 -   **Comparison operators:** `>`, `<`, `>=`, `<=`, `==`, `!=`
 
 ### Branching
@@ -3817,7 +4471,7 @@ default_symbol_table.set(Text('math'), Dictionary({
 
 def print_value(context, start_position, end_position, *arguments):
     print(*arguments)
-    return RuntimeResult().success(Null().set_context(context))
+    return RuntimeResult().success(NULL.set_context(context))
 
 def input_value(context, start_position, end_position, *arguments):
     if len(arguments) > 0:
@@ -3853,7 +4507,7 @@ def sleep_value(context, start_position, end_position, *arguments):
         ))
 
     sleep(get_object_from_value(arguments[0]))
-    return RuntimeResult().success(Null().set_context(context))
+    return RuntimeResult().success(NULL.set_context(context))
 
 def type_of_value(context, start_position, end_position, *arguments):
     if len(arguments) < 1:
@@ -3899,7 +4553,7 @@ def List_append(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
+    list_object = arguments[0].copy().detach()
     list_object.value.append(arguments[1])
 
     return RuntimeResult().success(list_object.set_context(context))
@@ -3926,12 +4580,12 @@ def List_remove(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
+    list_object = arguments[0].copy().detach()
     index = 0
     found = False
 
     for element in list_object.value:
-        if element.value == arguments[1].value:
+        if same_value(element, arguments[1]):
             found = True
             break
         
@@ -3964,8 +4618,7 @@ def List_contains(context, start_position, end_position, *arguments):
             context
         ))
 
-    object_list = list(map(lambda e: e.value, arguments[0].value))
-    return RuntimeResult().success(Number(arguments[1].value in object_list).set_context(context))
+    return RuntimeResult().success(boolean_value(value_index(arguments[0].value, arguments[1]) != -1).set_context(context))
 
 def List_extend(context, start_position, end_position, *arguments):
     if len(arguments) < 1:
@@ -3996,7 +4649,7 @@ def List_extend(context, start_position, end_position, *arguments):
             context
         ))
 
-    first_list = arguments[0].copy()
+    first_list = arguments[0].copy().detach()
     second_list = arguments[1].copy()
 
     for element in second_list.value:
@@ -4038,7 +4691,7 @@ def List_index_of(context, start_position, end_position, *arguments):
     found = False
 
     for element in list_object.value:
-        if element.value == arguments[1].value:
+        if same_value(element, arguments[1]):
             found = True
             break
         
@@ -4090,7 +4743,7 @@ def List_insert(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
+    list_object = arguments[0].copy().detach()
     index = arguments[1].copy()
     element = arguments[2].copy()
 
@@ -4133,7 +4786,7 @@ def List_pop(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
+    list_object = arguments[0].copy().detach()
     index = arguments[1].copy()
 
     list_object.value.pop(int(index.value))
@@ -4161,10 +4814,8 @@ def List_count(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
-    list_object.value = list(map(lambda e: e.value, list_object.value))
-
-    return RuntimeResult().success(Number(list_object.value.count(arguments[1].value)).set_context(context))
+    count = sum(same_value(element, arguments[1]) for element in arguments[0].value)
+    return RuntimeResult().success(Number(count).set_context(context))
 
 def List_remove_all(context, start_position, end_position, *arguments):
     if len(arguments) < 1:
@@ -4188,11 +4839,8 @@ def List_remove_all(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
-
-    for element in list_object.value.copy():
-        if element.value == arguments[1].value:
-            list_object.value.remove(element)
+    list_object = arguments[0].copy().detach()
+    list_object.value = [element for element in list_object.value if not same_value(element, arguments[1])]
 
     return RuntimeResult().success(list_object.set_context(context))
 
@@ -4225,15 +4873,17 @@ def List_subtract(context, start_position, end_position, *arguments):
             context
         ))
     
-    list_object = arguments[0].copy()
-    other = list(map(lambda e: e.value, arguments[1].value))
+    list_object = arguments[0].copy().detach()
+    other = list(arguments[1].value)
 
     indices = []
     index = 0
 
     for element in list_object.value:
-        if element.value in other:
-            other.remove(element.value)
+        position = value_index(other, element)
+
+        if position != -1:
+            other.pop(position)
             indices.append(index)
 
         index += 1
@@ -4273,14 +4923,14 @@ def List_subtract_all(context, start_position, end_position, *arguments):
             context
         ))
 
-    list_object = arguments[0].copy()
-    other = list(map(lambda e: e.value, arguments[1].value))
+    list_object = arguments[0].copy().detach()
+    other = list(arguments[1].value)
 
     indices = []
     index = 0
 
     for element in list_object.value:
-        if element.value in other:
+        if value_index(other, element) != -1:
             indices.append(index)
 
         index += 1
@@ -4425,19 +5075,10 @@ def Dictionary_merge(context, start_position, end_position, *arguments):
             context
         ))
 
-    dictionary = arguments[0].copy()
-    dictionary_keys = list(map(lambda e: e.value, dictionary.value.keys()))
-
-    other = arguments[1].copy()
-    other.value = { k.value: v.value for (k, v) in zip(other.value.keys(), other.value.values()) }
-
-    for key, value in dictionary.value.items():
-        if key.value in list(other.value.keys()):
-            dictionary.value[key] = get_value_from_object(other.value[key.value])
+    dictionary = arguments[0].copy().detach()
 
-    for key, value in other.value.items():
-        if key not in dictionary_keys:
-            dictionary.value[get_value_from_object(key)] = get_value_from_object(value)
+    for key, value in arguments[1].value.items():
+        dictionary.value[get_value_from_object(key.value).frozen()] = get_value_from_object(value.value)
 
     return RuntimeResult().success(dictionary.set_context(context))
 
@@ -4470,15 +5111,10 @@ def Dictionary_difference(context, start_position, end_position, *arguments):
             context
         ))
 
-    dictionary = arguments[0].copy()
-    other = arguments[1].copy()
-
-    keys = map(lambda e: e.value, list(other.value.keys()))
-    values = map(lambda e: e.value, list(other.value.values()))
-    other_dictionary = dict(zip(keys, values))
+    dictionary = arguments[0].copy().detach()
 
-    for key, value in dictionary.value.copy().items():
-        if key.value in other_dictionary and other_dictionary[key.value] == value.value:
+    for key, value in arguments[1].value.items():
+        if dictionary.value.get(key, None) == value:
             del dictionary.value[key]
 
     return RuntimeResult().success(dictionary.set_context(context))
@@ -4505,18 +5141,8 @@ def Dictionary_remove(context, start_position, end_position, *arguments):
             context
         ))
 
-    dictionary = arguments[0].copy()
-    found = False
-
-    for k, v in dictionary.value.items():
-        key = k
-
-        if key.value == arguments[1].value:
-            found = True
-            break
-
-    if found:
-        dictionary.value.pop(key)
+    dictionary = arguments[0].copy().detach()
+    dictionary.value.pop(arguments[1], None)
 
     return RuntimeResult().success(dictionary.copy().set_context(context))
 
@@ -4549,12 +5175,10 @@ def Dictionary_remove_many(context, start_position, end_position, *arguments):
             context
         ))
     
-    dictionary = arguments[0].copy()
-    keys = list(map(lambda e: e.value, arguments[1].value))
+    dictionary = arguments[0].copy().detach()
 
-    for key, value in dictionary.value.copy().items():
-        if key.value in keys:
-            dictionary.value.pop(key)
+    for key in arguments[1].value:
+        dictionary.value.pop(key, None)
 
     return RuntimeResult().success(dictionary.copy().set_context(context))
 
@@ -4587,19 +5211,18 @@ def Dictionary_add(context, start_position, end_position, *arguments):
             context
         ))
 
-    dictionary = arguments[0].copy()
+    dictionary = arguments[0].copy().detach()
     key = arguments[1].copy().value
     value = arguments[2]
 
-    for k, v in dictionary.value.items():
-        if k.value == key:
-            return RuntimeResult().failure(RuntimeError(
-                start_position, end_position,
-                'Key already exists: ' + key,
-                context
-            ))
+    if get_value_from_object(key) in dictionary.value:
+        return RuntimeResult().failure(RuntimeError(
+            start_position, end_position,
+            'Key already exists: ' + key,
+            context
+        ))
 
-    dictionary.value[get_value_from_object(key)] = value
+    dictionary.value[get_value_from_object(key).frozen()] = value
 
     return RuntimeResult().success(dictionary.set_context(context))
 
@@ -4857,7 +5480,7 @@ def dictionary_from_key_value_lists(context, start_position, end_position, *argu
 
     keys = arguments[0].value
     values = arguments[1].value
-    dictionary = dict(zip(keys, values))
+    dictionary = { key.frozen(): value for key, value in zip(keys, values) }
 
     return RuntimeResult().success(Dictionary(dictionary).set_context(context))
 
@@ -4885,7 +5508,7 @@ built_ins = {
     'Dictionary': dictionary_from_key_value_lists,
     'BuiltIn': lambda context, start_position, end_position, *arguments: convert_value(context, start_position, end_position, 'to_built_in', *arguments),
     'Boolean': lambda context, start_position, end_position, *arguments: convert_value(context, start_position, end_position, 'to_boolean', *arguments),
-    'Null': lambda context, start_position, end_position, *arguments: RuntimeResult().success(Null().set_context(context)),
+    'Null': lambda context, start_position, end_position, *arguments: RuntimeResult().success(NULL.set_context(context)),
     'List~append': List_append,
     'List~extend': List_extend,
     'List~remove': List_remove,
@@ -4916,6 +5539,11 @@ built_ins = {
     'is_defined': is_defined
 }
 
+# Functions registered under several names keep the first one
+for key, function in built_ins.items():
+    built_in_names.setdefault(function, key)
+    if not is_method_name(key): inlinable_names.add(key)
+
 for key in built_ins:
     default_symbol_table.set(Text(key), BuiltIn(built_ins[key]).set_context(global_context))
 
@@ -4927,359 +5555,1974 @@ global_context.symbol_table = global_symbol_table
 #endregion
 
 
-#region INTERPRETER
+#region OPTIMIZER
 
-class Interpreter():
-    def visit(self, node, context: Context):
-        method_name = f'visit_{type(node).__name__}'
+OPTIMIZER_MAX_TEXT_LENGTH = 256
 
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+def literal_value(node: Node) -> Number | Text | None:
+    if isinstance(node, NumberNode):
+        return Number(node.token.value).set_position(node.start_position, node.end_position)
     
-    def no_visit_method(self, node, context: Context):
-        raise NotImplementedError(f'No visit method was defined for {type(node).__name__}.')
+    if isinstance(node, TextNode):
+        return Text(node.token.value).set_position(node.start_position, node.end_position)
     
-    ## Visit Methods
+    return None
 
-    def visit_NumberNode(self, node: NumberNode, context: Context):
-        return RuntimeResult().success(
-            Number(node.token.value)
-                .set_context(context)
-                .set_position(node.start_position, node.end_position)
-        )
-    
-    def visit_TextNode(self, node: TextNode, context: Context):
-        return RuntimeResult().success(
-            Text(node.token.value)
-                .set_context(context)
-                .set_position(node.start_position, node.end_position)
-        )
-    
-    def visit_ListNode(self, node: ListNode, context: Context):
-        result = RuntimeResult()
-        elements = []
+def is_boolean_name(node: Node) -> bool:
+    return (
+        isinstance(node, VariableAccessNode) and is_plain_variable(node.variable_node) and
+        node.variable_node.variable_name_node.token.value in BOOLEAN_NAMES
+    )
 
-        for element_node in node.element_nodes:
-            elements.append(result.register(self.visit(element_node, context)))
-            if result.error: return result
+class Optimizer:
+    # Rewrites an AST into an equivalent one that does less work at runtime:
+    # folds operations on literals, removes branches that can't be taken and
+    # builds constant lists and dictionaries once
+    def __init__(self):
+        self.reset()
 
-        return result.success(
-            List(elements)\
-                .set_position(node.start_position, node.end_position)\
-                .set_context(context)
-        )
-    
-    def visit_DictionaryNode(self, node: DictionaryNode, context: Context):
-        result = RuntimeResult()
-        keys = []
-        values = []
+    def reset(self):
+        self.folded = 0
+        self.branches = 0
+        self.pooled = 0
+        self.changes = []
 
-        for key_node in list(node.node_dictionary.keys()):
-            keys.append(result.register(self.visit(key_node, context)))
-            if result.error: return result
+    def optimize_program(self, ast: ListNode) -> ListNode:
+        # The counts and changes are those of the last program optimized
+        self.reset()
 
-        for value_node in list(node.node_dictionary.values()):
-            values.append(result.register(self.visit(value_node, context)))
-            if result.error: return result
+        ast.element_nodes = [self.optimize(statement_node) for statement_node in ast.element_nodes]
+        return ast
 
-        return result.success(
-            Dictionary(dict(zip(keys, values)))\
-                .set_position(node.start_position, node.end_position)\
-                .set_context(context)
-        )
+    def optimize(self, node: Node | None) -> Node | None:
+        if node is None: return None
 
-    def visit_BinaryOperationNode(self, node: BinaryOperationNode, context: Context):
-        result = RuntimeResult()
+        method = getattr(self, f'optimize_{type(node).__name__}', None)
+        return method(node) if method is not None else node
+    
+    def record(self, node: Node, change: str):
+        position = node.start_position
+        self.changes.append(f'File {position.file_name}, line {position.line + 1}, character {position.column + 1}: {change}')
 
-        left = result.register(self.visit(node.left_node, context))
-        if result.error: return result
+    def fold(self, node: Node, value: Value) -> Node | None:
+        if isinstance(value, Number):
+            folded_node = NumberNode(Token(TT_NUMBER, value.value, node.source, node.start, node.end))
+        elif isinstance(value, Text) and len(value.value) <= OPTIMIZER_MAX_TEXT_LENGTH:
+            folded_node = TextNode(Token(TT_TEXT, value.value, node.source, node.start, node.end))
+        else:
+            return None
+        
+        self.folded += 1
+        self.record(node, f'folded into {value!r}')
 
-        right = result.register(self.visit(node.right_node, context))
-        if result.error: return result
+        return folded_node
+    
+    def pool(self, node: ListNode | DictionaryNode) -> ConstantNode:
+        value = Interpreter().evaluate(node, None)
 
-        ## Arithmetic expressions
-        if node.operator_token.type == TT_ADD:
-            output = result.register(left.added_to(right))
-        elif node.operator_token.type == TT_SUBTRACT:
-            output = result.register(left.subtracted_by(right))
-        elif node.operator_token.type == TT_MULIPLY:
-            output = result.register(left.multiplied_by(right))
-        elif node.operator_token.type == TT_DIVIDE:
-            output = result.register(left.divided_by(right))
-        elif node.operator_token.type == TT_POWER:
-            output = result.register(left.powered_by(right))
-
-        ## Comparaison expressions
-        elif node.operator_token.type == TT_DOUBLE_EQUALS:
-            output = result.register(left.is_equals_to(right))
-        elif node.operator_token.type == TT_NOT_EQUALS:
-            output = result.register(left.is_not_equals_to(right))
-        elif node.operator_token.type == TT_GREATER_THAN:
-            output = result.register(left.is_greater_than(right))
-        elif node.operator_token.type == TT_LESS_THAN:
-            output = result.register(left.is_less_than(right))
-        elif node.operator_token.type == TT_GREATER_THAN_OR_EQUALS:
-            output = result.register(left.is_greater_or_equals(right))
-        elif node.operator_token.type == TT_LESS_THAN_OR_EQUALS:
-            output = result.register(left.is_less_or_equals(right))
-
-        ## Logical operators
-        elif node.operator_token.matches(TT_KEYWORD, 'and'):
-            output = result.register(left.and_(right))
-        elif node.operator_token.matches(TT_KEYWORD, 'or'):
-            output = result.register(left.or_(right))
+        # Every evaluation copies the value and shares the elements, nested ones included,
+        # so they must never be positioned in place or be the same element for '=='
+        pending = [value]
 
-        if result.error: return result
-        
-        return result.success(output
-            .set_context(context)
-            .set_position(node.start_position, node.end_position
-        ))
-    
-    def visit_UnaryOperationNode(self, node: UnaryOperationNode, context: Context):
-        result = RuntimeResult()
+        while pending:
+            element = interned(pending.pop())
 
-        number = result.register(self.visit(node.node, context))
-        if result.error: return result
+            if isinstance(element, List): pending.extend(element.value)
+            elif isinstance(element, Dictionary): pending.extend(item for pair in element.value.items() for item in pair)
 
-        if node.operation_token.type == TT_SUBTRACT:
-            number = result.register(number.multiplied_by(Number(-1)))
-        elif node.operation_token.matches(TT_KEYWORD, 'not'):
-            number = result.register(number.not_())
-        
-        if result.error: return result
-        
-        return result.success(number
-            .set_context(context)
-            .set_position(node.start_position, node.end_position
-        ))
+        self.pooled += 1
+        self.record(node, 'pooled constant')
+
+        return ConstantNode(value, node.source, node.start, node.end)
     
-    def visit_VariableNode(self, node: VariableNode, context: Context):
-        result = RuntimeResult()
+    def branch(self, node: Node, body_node: Node | None, chained: bool = False, guarded: bool = False) -> BranchNode:
+        self.branches += 1
+        self.record(node, 'removed untaken branch, guarded by true/false' if guarded else 'removed untaken branch')
 
-        variable_name = result.register(self.visit(node.variable_name_node, context))
-        if result.error: return result
+        return BranchNode(node, body_node, chained, node if guarded else None)
 
-        scope_visit = result.register(self.visit(node.scope_node, context)) if node.scope_node else Number(0)
-        if result.error: return result
+    ## Optimize Methods
 
-        if isinstance(scope_visit, Number):
-            if scope_visit.value < 0:
-                return result.failure(RuntimeError(
-                    node.start_position, node.scope_node.end_position.copy().advance(),
-                    "Can't access scope from a negative number",
-                    context
-                ))
-            
-            if not scope_visit.value.is_integer():
-                return result.failure(RuntimeError(
-                    node.start_position, node.scope_node.end_position.copy().advance(),
-                    "Can't access scope from a decimal number",
-                    context
-                ))
+    def optimize_BinaryOperationNode(self, node: BinaryOperationNode) -> Node:
+        node.left_node = self.optimize(node.left_node)
+        left = literal_value(node.left_node)
 
-            scope = context.symbol_table
+        # A literal that decides 'and'/'or' on its own makes the right side unreachable
+        if left is not None and node.short_circuit is not None:
+            if bool(left.to_boolean().value.value) == node.short_circuit:
+                return self.fold(node, boolean_value(node.short_circuit))
 
-            for _ in range(int(scope_visit.value)):
-                scope = scope.parent
+        node.right_node = self.optimize(node.right_node)
+        right = literal_value(node.right_node)
 
-                if not scope:
-                    return result.failure(RuntimeError(
-                        node.start_position, node.scope_node.end_position.copy().advance(),
-                        "Scope is out of range",
-                        context
-                    ))
-                
-        elif isinstance(scope_visit, SymbolTable):
-            scope = scope_visit
+        if left is None or right is None: return node
+
+        try: output = getattr(left, node.operation)(right)
+        except Exception: return node
 
-        return result.success((variable_name, scope, node.scope_node is not None))
+        if output.error: return node
+        return self.fold(node, output.value) or node
     
-    def visit_VariableAccessNode(self, node: VariableAccessNode, context: Context):
-        result = RuntimeResult()
+    def optimize_UnaryOperationNode(self, node: UnaryOperationNode) -> Node:
+        node.node = self.optimize(node.node)
+        operand = literal_value(node.node)
 
-        variable_data = result.register(self.visit(node.variable_node, context))
-        if result.error: return result
+        if operand is None: return node
 
-        variable_name, scope, explicit = variable_data
-        value = scope.get(variable_name, explicit)
+        try:
+            if node.operation_token.type == TT_SUBTRACT:
+                output = operand.multiplied_by(number_value(-1))
+            elif node.operation_token.matches(TT_KEYWORD, 'not'):
+                output = operand.not_()
+            else:
+                output = RuntimeResult().success(operand)
+        except Exception: return node
 
-        if not value:
-            return result.failure(RuntimeError(
-                node.start_position, node.end_position,
-                f"Variable '{variable_name}' is not defined.",
-                context
-            ))
+        if output.error: return node
+        return self.fold(node, output.value) or node
+    
+    def optimize_ListNode(self, node: ListNode) -> Node:
+        node.element_nodes = [self.optimize(element_node) for element_node in node.element_nodes]
 
-        value = value.copy().set_position(node.start_position, node.end_position) # Fix position for error messages
-        return result.success(value)
+        if all(isinstance(element_node, NumberNode) for element_node in node.element_nodes):
+            return self.pool(node)
+        
+        return node
     
-    def visit_VariableAssignmentNode(self, node: VariableAssignmentNode, context: Context):
-        result = RuntimeResult()
+    def optimize_DictionaryNode(self, node: DictionaryNode) -> Node:
+        node.node_dictionary = { self.optimize(key_node): self.optimize(value_node) for key_node, value_node in node.node_dictionary.items() }
+
+        if (
+            all(isinstance(key_node, (NumberNode, TextNode)) for key_node in node.node_dictionary.keys()) and
+            all(isinstance(value_node, NumberNode) for value_node in node.node_dictionary.values())
+        ):
+            return self.pool(node)
         
-        variable_data = result.register(self.visit(node.variable_node, context))
-        if result.error: return result
+        return node
+    
+    def optimize_VariableNode(self, node: VariableNode) -> Node:
+        node.variable_name_node = self.optimize(node.variable_name_node)
+        node.scope_node = self.optimize(node.scope_node)
 
-        variable_name, scope, explicit = variable_data
+        return node
+    
+    def optimize_VariableAssignmentNode(self, node: VariableAssignmentNode) -> Node:
+        node.variable_node = self.optimize(node.variable_node)
+        node.value_node = self.optimize(node.value_node)
 
-        value = result.register(self.visit(node.value_node, context))
-        if result.error: return result
+        return node
+    
+    def optimize_VariableAccessNode(self, node: VariableAccessNode) -> Node:
+        node.variable_node = self.optimize(node.variable_node)
+        return node
+    
+    def optimize_CallNode(self, node: CallNode) -> Node:
+        node.node_to_call = self.optimize(node.node_to_call)
+        node.argument_nodes = [self.optimize(argument_node) for argument_node in node.argument_nodes]
 
-        if explicit:
-            scope.set(variable_name, value)
-        else:
-            levels_up = 0
-            current_table = context.symbol_table
+        return node
+    
+    def optimize_IndexingNode(self, node: IndexingNode) -> Node:
+        node.base_node = self.optimize(node.base_node)
+        node.index_node = self.optimize(node.index_node)
 
-            while True:
-                if current_table.parent is None:
-                    levels_up = 0
-                    current_table = context.symbol_table
-                    break
+        return node
+    
+    def optimize_IndexAssignmentNode(self, node: IndexAssignmentNode) -> Node:
+        node.variable_node = self.optimize(node.variable_node)
+        node.indexing_node.base_node = self.optimize(node.indexing_node.base_node)
+        node.indexing_node.index_node = self.optimize(node.indexing_node.index_node)
+        node.value_node = self.optimize(node.value_node)
 
-                levels_up += 1
-                current_table = current_table.parent
+        return node
+    
+    def optimize_IfNode(self, node: IfNode, collapse: bool = True) -> Node:
+        chained = isinstance(node.false_node, IfNode)
 
-                if current_table.get(variable_name) is not None:
-                    break
+        node.condition_node = self.optimize(node.condition_node)
+        node.true_node = self.optimize(node.true_node)
 
-            current_table.set(variable_name, value)
+        # Chained conditions stay IfNodes, their parent checks for it
+        node.false_node = self.optimize_IfNode(node.false_node, False) if chained else self.optimize(node.false_node)
 
-        return(result.success(value))
-    
-    def visit_CallNode(self, node: CallNode, context: Context):
-        result = RuntimeResult()
-        arguments = []
+        if not collapse: return node
 
-        value_to_call = result.register(self.visit(node.node_to_call, context))
-        if result.error: return result
+        condition = literal_value(node.condition_node)
+        guarded = condition is None and is_boolean_name(node.condition_node)
 
-        value_to_call = value_to_call.copy().set_position(node.start_position, node.end_position)
+        if guarded:
+            condition = default_symbol_table.get(node.condition_node.variable_node.name_key)
+            
+        if condition is None: return node
 
-        for argument_node in node.argument_nodes:
-            arguments.append(result.register(self.visit(argument_node, context)))
-            if result.error: return result
+        if condition.to_boolean().value.value == 1:
+            return self.branch(node, node.true_node, False, guarded)
+        
+        if node.false_node is not None:
+            return self.branch(node, node.false_node, chained, guarded)
+        
+        return self.branch(node, None, False, guarded)
+    
+    def optimize_WhileNode(self, node: WhileNode) -> Node:
+        node.condition_node = self.optimize(node.condition_node)
+        node.while_node = self.optimize(node.while_node)
 
-        return_value = result.register(value_to_call.execute(arguments))
-        if result.error: return result
+        condition = literal_value(node.condition_node)
+        guarded = condition is None and is_boolean_name(node.condition_node)
 
-        return result.success(return_value)
+        if guarded:
+            condition = default_symbol_table.get(node.condition_node.variable_node.name_key)
+
+        if condition is None or condition.to_boolean().value.value == 1: return node
+        return self.branch(node, None, False, guarded)
     
-    def visit_IndexingNode(self, node: IndexingNode, context: Context):
-        result = RuntimeResult()
+    def report(self) -> str:
+        return '\n'.join([repr(self), *self.changes])
 
-        base_value = result.register(self.visit(node.base_node, context))
-        if result.error: return result
+    def __repr__(self) -> str:
+        return f'Optimizer: {self.folded} folded, {self.branches} branches removed, {self.pooled} constants pooled'
 
-        index_value = result.register(self.visit(node.index_node, context))
-        if result.error: return result
+optimizer = Optimizer()
 
-        if node.allow_methods:
-            method_name = type(base_value).__name__ + "~" + str(index_value)
-            function = context.symbol_table.get(Text(method_name))
+#endregion
 
-            if isinstance(function, (BuiltIn, Text)):
-                function.base_value = base_value
-                return result.success(function)
 
-        index_result = result.register(base_value.index(index_value))
-        if result.error: return result
+#region INTERPRETER
 
-        return result.success(index_result.set_context(index_value.context))
-    
-    def visit_IndexAssignmentNode(self, node: IndexAssignmentNode, context: Context):
-        result = RuntimeResult()
+QUICKENING_THRESHOLD = 8
 
-        base_value = result.register(self.visit(node.indexing_node.base_node, context))
-        if result.error: return result
+class Quickening:
+    # Nodes and VM instructions are rewritten in place into a specialized form once
+    # they have seen the same types QUICKENING_THRESHOLD times, and rewritten back
+    # for good the first time a guard fails
+    def __init__(self):
+        self.specialized = 0
+        self.guard_failures = 0
 
-        index_value = result.register(self.visit(node.indexing_node.index_node, context))
-        if result.error: return result
+    def specialize(self, node: Node, node_class: type | None = None):
+        if node_class is not None: node.__class__ = node_class
+        self.specialized += 1
 
-        value_value = result.register(self.visit(node.value_node, context))
-        if result.error: return result
+    def despecialize(self, node: Node, node_class: type | None = None):
+        if node_class is not None: node.__class__ = node_class
 
-        output_value = result.register(base_value.assign_index(index_value, value_value))
-        if result.error: return result
+        node.hits = None
+        self.guard_failures += 1
 
-        variable_node = node.variable_node
-        assignment_node = VariableAssignmentNode(variable_node, ValueNode(output_value))
+    def __repr__(self) -> str:
+        return f'Quickening: {self.specialized} sites specialized, {self.guard_failures} guard failures'
 
-        result.register(self.visit(assignment_node, context))
-        if result.error: return result
+quickening = Quickening()
 
-        return result.success(Null().set_context(index_value.context))
+## Superinstructions
 
-    def visit_ValueNode(self, node: ValueNode, context: Context):
-        return RuntimeResult().success(node.value)
+# Each returns None when the variables don't hold the expected types, the
+# engine then runs the generic path of the node, which also reports errors
 
-    def visit_NullNode(self, node: NullNode, context: Context):
-        return RuntimeResult().success(Null())
+def update_variable(node: UpdateVariableNode, context: Context) -> Number | Text | None:
+    value = context.symbol_table.get(node.name_key)
+    if type(value) is not node.value_type: return None
 
-    def visit_GlobalScopeNode(self, node: GlobalScopeNode, context: Context):
-        return RuntimeResult().success(global_symbol_table)
-    
-    def visit_DefaultScopeNode(self, node: GlobalScopeNode, context: Context):
-        return RuntimeResult().success(default_symbol_table)
+    updated = node.value_type(node.function(value.value, node.literal))
+    updated.context = context
+    updated.start_position = node.value_node.start_position
+    updated.end_position = node.value_node.end_position
 
-    def visit_IfNode(self, node: IfNode, context: Context):
-        result = RuntimeResult()
+    assign_variable(node.name_key, context.symbol_table, False, updated, context)
+    return updated
 
-        condition = result.register(self.visit(node.condition_node, context))
-        if result.error: return result
+def compare_variable(node: CompareVariableNode, context: Context) -> Number | None:
+    value = context.symbol_table.get(node.name_key)
+    if type(value) is not Number: return None
 
-        condition_boolean = result.register(condition.to_boolean())
-        if result.error: return result
+    return boolean_value(node.function(value.value, node.literal))
 
-        if condition_boolean.value == 1:
-            value_to_call = result.register(self.visit(node.true_node, context))
-            if result.error: return result
+def index_variables(node: IndexVariableNode, context: Context) -> Value | None:
+    base_value = context.symbol_table.get(node.base_key)
+    index_value = context.symbol_table.get(node.index_key)
 
-            return_result = result.register(value_to_call.execute([]))
-            if result.error: return result
+    if type(base_value) is not List or type(index_value) is not Number: return None
+    position = index_value.value
 
-            return result.success(return_result)
-        
-        if condition_boolean.value == 0 and node.false_node is not None:
-            value_to_call = result.register(self.visit(node.false_node, context))
-            if result.error: return result
+    if not (0 <= position < len(base_value.value) and position.is_integer()): return None
 
-            if isinstance(node.false_node, IfNode):
-                return result.success(value_to_call.set_context(context))
+    element = base_value.value[int(position)]
+    if element.interned: element = element.copy()
 
-            return_result = result.register(value_to_call.execute([]))
-            if result.error: return result
+    return element\
+        .set_position(node.base_node.start_position, node.index_node.end_position)\
+        .set_context(index_value.context)
+
+def resolve_scope(node: VariableNode, scope_visit, context: Context) -> RuntimeResult:
+    result = RuntimeResult()
+
+    if isinstance(scope_visit, Number):
+        if scope_visit.value < 0:
+            return result.failure(RuntimeError(
+                node.start_position, node.scope_node.end_position.copy().advance(),
+                "Can't access scope from a negative number",
+                context
+            ))
+        
+        if not scope_visit.value.is_integer():
+            return result.failure(RuntimeError(
+                node.start_position, node.scope_node.end_position.copy().advance(),
+                "Can't access scope from a decimal number",
+                context
+            ))
+
+        scope = context.symbol_table
+
+        for _ in range(int(scope_visit.value)):
+            scope = scope.parent
+
+            if not scope:
+                return result.failure(RuntimeError(
+                    node.start_position, node.scope_node.end_position.copy().advance(),
+                    "Scope is out of range",
+                    context
+                ))
+            
+    elif isinstance(scope_visit, SymbolTable):
+        scope = scope_visit
+
+    return result.success(scope)
+
+def assignment_table(variable_name: Value, context: Context) -> SymbolTable:
+    # Names defined anywhere above are rebound in the immediate parent table,
+    # new names are bound locally
+    parent = context.symbol_table.parent
+
+    if parent is not None and parent.get(variable_name) is not None:
+        return parent
+
+    return context.symbol_table
+
+def assign_variable(variable_name: Value, scope: SymbolTable, explicit: bool, value: Value, context: Context):
+    # Interned values are shared, the variable holds a copy carrying the context
+    # the value was assigned in, which is where errors on it are reported from
+    if value.interned: value = value.copy().set_context(context)
+
+    if explicit:
+        scope.set(variable_name, value)
+        return
+
+    assignment_table(variable_name, context).set(variable_name, value)
+
+def owned_index_target(variable_name: Value, context: Context) -> List | Dictionary | None:
+    # 'list[0] = 1' can update the bound container in place when the variable is
+    # read from and rebound in the same table, and nothing else references it
+    table = assignment_table(variable_name, context)
+
+    if table is not context.symbol_table and context.symbol_table.get(variable_name, True) is not None:
+        return None
+    
+    return table.get_owned(variable_name)
+
+def assign_index_variable(variable_name: Value, scope: SymbolTable, explicit: bool, base_value: Value, value: Value, context: Context):
+    table = scope if explicit else assignment_table(variable_name, context)
+
+    # Containers updated in place are already bound
+    if table.symbols.get(variable_name.value, None) is base_value: return
+    table.set(variable_name, value)
+
+    # assign_index returns a new container that only this binding holds,
+    # later updates through the same name can be made in place
+    if isinstance(value, (List, Dictionary)): value.owned = True
+
+def resolve_method(node: IndexingNode, base_value: Value, index_value: Value, context: Context) -> BuiltIn | Text | None:
+    # Each call site remembers the last method it resolved, valid while the receiver type,
+    # the method name and the root of the chain are the same and no 'Type~method' binding
+    # changed. Methods bound in a live table below the root are looked up on every call
+    table = context.symbol_table
+    root = table.root
+    cache = node.method_cache
+
+    if (
+        cache is not None and cache[0] is type(base_value) and cache[1] is type(index_value) and
+        cache[2] == index_value.value and cache[3] == SymbolTable.method_version and cache[4]() is root
+    ):
+        function = cache[5]
+    else:
+        name = type(base_value).__name__ + "~" + str(index_value)
+
+        function = table.get(Text(name))
+        if not isinstance(function, (BuiltIn, Text)): function = None
+
+        node.method_cache = None if name in root.shadowed_names else (
+            type(base_value), type(index_value), index_value.value,
+            SymbolTable.method_version, weakref.ref(root), function
+        )
+
+    return function.bind(base_value) if function is not None else None
+
+def inlined_built_in(node: CallNode, context: Context) -> BuiltIn | None:
+    # A built-in name that no live table below the root has bound resolves to the root of
+    # the chain, so each call site remembers the root's binding while its version is
+    # the same and calls it without looking up or copying the callee
+    name = node.built_in_name
+    if name is None: return None
+
+    root = context.symbol_table.root
+    if name in root.shadowed_names: return None
+
+    cache = node.built_in_cache
+
+    if cache is not None and cache[0]() is root and cache[1] == root.version:
+        return cache[2]
+
+    function = root.symbols.get(name, None)
+    if type(function) is not BuiltIn: function = None
+
+    node.built_in_cache = (weakref.ref(root), root.version, function)
+    return function
+
+def call_value(value: Value, arguments: list[Value], start_position: Position, end_position: Position) -> RuntimeResult:
+    # Functions receive the position of the call, so the callee doesn't need to be copied
+    if isinstance(value, (Text, BuiltIn)):
+        return value.execute(arguments, start_position, end_position)
+    
+    return value.copy().set_position(start_position, end_position).execute(arguments)
+
+def positioned(value: Value, node: Node, context: Context) -> Value:
+    # Copy of an interned value placed at the node that produced it, for the
+    # operations that report errors from the positions of their operands
+    return value.copy().set_position(node.start_position, node.end_position).set_context(context)
+
+class Interpreter():
+    visit_methods = {}
+
+    def visit(self, node, context: Context) -> RuntimeResult:
+        try:
+            return RuntimeResult().success(self.evaluate(node, context))
+        except RuntimeFailure as failure:
+            return RuntimeResult().failure(failure.error)
+
+    def evaluate(self, node, context: Context):
+        # Visit methods return the value directly and raise RuntimeFailure on errors
+        method = self.visit_methods.get(type(node), None)
+
+        if method is None:
+            method = getattr(type(self), f'visit_{type(node).__name__}', type(self).no_visit_method)
+            self.visit_methods[type(node)] = method
+
+        return method(self, node, context)
+    
+    def no_visit_method(self, node, context: Context):
+        raise NotImplementedError(f'No visit method was defined for {type(node).__name__}.')
+    
+    ## Visit Methods
+
+    def visit_NumberNode(self, node: NumberNode, context: Context):
+        return Number(node.token.value)\
+            .set_context(context)\
+            .set_position(node.start_position, node.end_position)
+    
+    def visit_TextNode(self, node: TextNode, context: Context):
+        return Text(node.token.value)\
+            .set_context(context)\
+            .set_position(node.start_position, node.end_position)
+    
+    def visit_ListNode(self, node: ListNode, context: Context):
+        # A loop rather than a comprehension, bodies are lists and a comprehension
+        # adds a frame to every nested call
+        elements = []
+        for element_node in node.element_nodes: elements.append(self.evaluate(element_node, context))
+
+        # The last statement of a body is what a Text call returns
+        if elements and elements[-1].interned: elements[-1] = positioned(elements[-1], node.element_nodes[-1], context)
+
+        return List(elements)\
+            .set_position(node.start_position, node.end_position)\
+            .set_context(context)
+    
+    def visit_DictionaryNode(self, node: DictionaryNode, context: Context):
+        keys = [self.evaluate(key_node, context) for key_node in list(node.node_dictionary.keys())]
+        values = [self.evaluate(value_node, context) for value_node in list(node.node_dictionary.values())]
+
+        return Dictionary({ key.frozen(): value for key, value in zip(keys, values) })\
+            .set_position(node.start_position, node.end_position)\
+            .set_context(context)
+
+    def visit_BinaryOperationNode(self, node: BinaryOperationNode, context: Context):
+        left = self.evaluate(node.left_node, context)
+
+        if node.short_circuit is not None and bool(unwrap(left.to_boolean()).value) == node.short_circuit:
+            output = boolean_value(node.short_circuit)
+        else:
+            right = self.evaluate(node.right_node, context)
+
+            if node.hits is not None and type(left) is Number and type(right) is Number:
+                node.hits += 1
+                if node.hits == QUICKENING_THRESHOLD: quickening.specialize(node, NumberOperationNode)
+
+            if left.interned: left = positioned(left, node.left_node, context)
+            if right.interned: right = positioned(right, node.right_node, context)
+
+            output = unwrap(getattr(left, node.operation)(right))
+        
+        return output\
+            .set_context(context)\
+            .set_position(node.start_position, node.end_position)
+    
+    def visit_NumberOperationNode(self, node: NumberOperationNode, context: Context):
+        left = self.evaluate(node.left_node, context)
+        right = self.evaluate(node.right_node, context)
+
+        if type(left) is not Number or type(right) is not Number:
+            quickening.despecialize(node, BinaryOperationNode)
+
+            if left.interned: left = positioned(left, node.left_node, context)
+            if right.interned: right = positioned(right, node.right_node, context)
+
+            return unwrap(getattr(left, node.operation)(right))\
+                .set_context(context)\
+                .set_position(node.start_position, node.end_position)
+        
+        output = NUMBER_OPERATIONS[node.operation](left.value, right.value)
+        if type(output) is bool: return boolean_value(output)
+
+        number = Number(output)
+        number.context = context
+        number.start_position = node.start_position
+        number.end_position = node.end_position
+
+        return number
+    
+    def visit_UnaryOperationNode(self, node: UnaryOperationNode, context: Context):
+        number = self.evaluate(node.node, context)
+
+        if node.operation_token.type == TT_SUBTRACT:
+            if number.interned: number = positioned(number, node.node, context)
+            number = unwrap(number.multiplied_by(number_value(-1)))
+        elif node.operation_token.matches(TT_KEYWORD, 'not'):
+            number = unwrap(number.not_())
+        
+        return number\
+            .set_context(context)\
+            .set_position(node.start_position, node.end_position)
+    
+    def visit_VariableNode(self, node: VariableNode, context: Context):
+        variable_name = node.name_key if node.name_key is not None else self.evaluate(node.variable_name_node, context)
+        if not node.scope_node: return (variable_name, context.symbol_table, False)
+
+        scope = unwrap(resolve_scope(node, self.evaluate(node.scope_node, context), context))
+        return (variable_name, scope, True)
+    
+    def visit_VariableAccessNode(self, node: VariableAccessNode, context: Context):
+        variable_name, scope, explicit = self.evaluate(node.variable_node, context)
+        value = scope.get(variable_name, explicit)
+
+        if not value:
+            raise RuntimeFailure(RuntimeError(
+                node.start_position, node.end_position,
+                f"Variable '{variable_name}' is not defined.",
+                context
+            ))
+
+        if node.hits is not None:
+            node.hits += 1
+
+            if node.hits == QUICKENING_THRESHOLD: quickening.specialize(node, NameAccessNode)
+
+        return value.copy().set_position(node.start_position, node.end_position) # Fix position for error messages
+    
+    def visit_NameAccessNode(self, node: NameAccessNode, context: Context):
+        value = context.symbol_table.get(node.name_key)
+
+        if not value:
+            quickening.despecialize(node, VariableAccessNode)
+            return self.visit_VariableAccessNode(node, context)
+
+        return value.copy().set_position(node.start_position, node.end_position)
+    
+    def visit_VariableAssignmentNode(self, node: VariableAssignmentNode, context: Context):
+        variable_name, scope, explicit = self.evaluate(node.variable_node, context)
+        value = self.evaluate(node.value_node, context)
+
+        assign_variable(variable_name, scope, explicit, value, context)
+        return value
+    
+    def visit_CallNode(self, node: CallNode, context: Context):
+        value_to_call = inlined_built_in(node, context)
+        if value_to_call is None: value_to_call = self.evaluate(node.node_to_call, context)
+        arguments = [self.evaluate(argument_node, context) for argument_node in node.argument_nodes]
+
+        return unwrap(call_value(value_to_call, arguments, node.start_position, node.end_position))
+    
+    def visit_IndexingNode(self, node: IndexingNode, context: Context):
+        base_value = self.evaluate(node.base_node, context)
+        index_value = self.evaluate(node.index_node, context)
+
+        if node.allow_methods:
+            function = resolve_method(node, base_value, index_value, context)
+            if function is not None: return function
+
+        elif node.hits is not None and type(base_value) is List and type(index_value) is Number:
+            node.hits += 1
+            if node.hits == QUICKENING_THRESHOLD: quickening.specialize(node, ListIndexingNode)
+
+        if base_value.interned: base_value = positioned(base_value, node.base_node, context)
+        if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+
+        return unwrap(base_value.index(index_value)).set_context(index_value.context)
+    
+    def visit_ListIndexingNode(self, node: ListIndexingNode, context: Context):
+        base_value = self.evaluate(node.base_node, context)
+        index_value = self.evaluate(node.index_node, context)
+
+        if type(base_value) is not List or type(index_value) is not Number:
+            quickening.despecialize(node, IndexingNode)
+
+            if base_value.interned: base_value = positioned(base_value, node.base_node, context)
+            if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+
+            return unwrap(base_value.index(index_value)).set_context(index_value.context)
+
+        position = index_value.value
+
+        # Errors are left to List.index
+        if not (0 <= position < len(base_value.value) and position.is_integer()):
+            if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+            return unwrap(base_value.index(index_value)).set_context(index_value.context)
+        
+        element = base_value.value[int(position)]
+        if element.interned: element = element.copy()
+
+        return element\
+            .set_position(node.base_node.start_position, node.index_node.end_position)\
+            .set_context(index_value.context)
+    
+    def visit_UpdateVariableNode(self, node: UpdateVariableNode, context: Context):
+        value = update_variable(node, context)
+        return value if value is not None else self.visit_VariableAssignmentNode(node, context)
+    
+    def visit_CompareVariableNode(self, node: CompareVariableNode, context: Context):
+        value = compare_variable(node, context)
+        return value if value is not None else self.visit_BinaryOperationNode(node, context)
+    
+    def visit_IndexVariableNode(self, node: IndexVariableNode, context: Context):
+        value = index_variables(node, context)
+        return value if value is not None else self.visit_IndexingNode(node, context)
+    
+    def visit_IndexAssignmentNode(self, node: IndexAssignmentNode, context: Context):
+        base_node = node.indexing_node.base_node
+        base_value = None
+
+        if node.target_key is not None:
+            base_value = owned_index_target(node.target_key, context)
+            if base_value is not None: base_value.set_position(base_node.start_position, base_node.end_position)
+
+        if base_value is None:
+            base_value = self.evaluate(base_node, context)
+            if base_value.interned: base_value = positioned(base_value, base_node, context)
+
+        index_value = self.evaluate(node.indexing_node.index_node, context)
+        if index_value.interned: index_value = positioned(index_value, node.indexing_node.index_node, context)
+
+        value_value = self.evaluate(node.value_node, context)
+        output_value = unwrap(base_value.assign_index(index_value, value_value))
+
+        variable_name, scope, explicit = self.evaluate(node.variable_node, context)
+        assign_index_variable(variable_name, scope, explicit, base_value, output_value, context)
+
+        return NULL.set_context(index_value.context)
+
+    def visit_ValueNode(self, node: ValueNode, context: Context):
+        return node.value
+
+    def visit_NullNode(self, node: NullNode, context: Context):
+        return NULL
+
+    def visit_GlobalScopeNode(self, node: GlobalScopeNode, context: Context):
+        return global_symbol_table
+    
+    def visit_DefaultScopeNode(self, node: GlobalScopeNode, context: Context):
+        return default_symbol_table
+
+    def visit_ConstantNode(self, node: ConstantNode, context: Context):
+        return node.value.copy()\
+            .set_position(node.start_position, node.end_position)\
+            .set_context(context)
+    
+    def visit_BranchNode(self, node: BranchNode, context: Context):
+        if node.guard_node is not None and not booleans_are_default():
+            return self.evaluate(node.guard_node, context)
+        
+        if node.body_node is None:
+            return NULL.set_context(context)
+        
+        value_to_call = self.evaluate(node.body_node, context)
+
+        if node.chained:
+            return value_to_call.set_context(context)
+        
+        return unwrap(value_to_call.execute([]))
+
+    def visit_IfNode(self, node: IfNode, context: Context):
+        condition = self.evaluate(node.condition_node, context)
+        condition_boolean = unwrap(condition.to_boolean())
+
+        if condition_boolean.value == 1:
+            value_to_call = self.evaluate(node.true_node, context)
+            return unwrap(value_to_call.execute([]))
+        
+        if condition_boolean.value == 0 and node.false_node is not None:
+            value_to_call = self.evaluate(node.false_node, context)
+
+            if isinstance(node.false_node, IfNode):
+                return value_to_call.set_context(context)
+
+            return unwrap(value_to_call.execute([]))
+
+        return NULL.set_context(context)
+    
+    def visit_WhileNode(self, node: WhileNode, context: Context):
+        while True:
+            condition = self.evaluate(node.condition_node, context)
+            condition_boolean = unwrap(condition.to_boolean())
+
+            if condition_boolean.value == 1:
+                value_to_call = self.evaluate(node.while_node, context)
+                unwrap(value_to_call.execute([]))
+            else:
+                break
+
+        return NULL.set_context(context)
+    
+#endregion
+
+
+#region CLOSURE COMPILER
+
+class ClosureCompiler:
+    def run(self, node: Node, context: Context) -> RuntimeResult:
+        try:
+            return RuntimeResult().success(self.compile(node)(context))
+        except RuntimeFailure as failure:
+            return RuntimeResult().failure(failure.error)
+
+    def compile(self, node: Node):
+        # Closures return the value directly and raise RuntimeFailure on errors
+        if node.closure is None:
+            method_name = f'compile_{type(node).__name__}'
+
+            method = getattr(self, method_name, self.no_compile_method)
+            node.closure = method(node)
+
+        return node.closure
+    
+    def no_compile_method(self, node: Node):
+        raise NotImplementedError(f'No compile method was defined for {type(node).__name__}.')
+    
+    ## Compile Methods
+
+    def compile_NumberNode(self, node: NumberNode):
+        value = node.token.value
+        start_position, end_position = node.start_position, node.end_position
+
+        def number(context: Context) -> Number:
+            return Number(value)\
+                .set_context(context)\
+                .set_position(start_position, end_position)
+
+        return number
+    
+    def compile_TextNode(self, node: TextNode):
+        value = node.token.value
+        start_position, end_position = node.start_position, node.end_position
+
+        def text(context: Context) -> Text:
+            return Text(value)\
+                .set_context(context)\
+                .set_position(start_position, end_position)
+
+        return text
+    
+    def compile_ListNode(self, node: ListNode):
+        element_closures = [self.compile(element_node) for element_node in node.element_nodes]
+        last_node = node.element_nodes[-1] if node.element_nodes else None
+        start_position, end_position = node.start_position, node.end_position
+
+        def list_(context: Context) -> List:
+            elements = [element_closure(context) for element_closure in element_closures]
+
+            # The last statement of a body is what a Text call returns
+            if elements and elements[-1].interned: elements[-1] = positioned(elements[-1], last_node, context)
+
+            return List(elements)\
+                .set_position(start_position, end_position)\
+                .set_context(context)
+
+        return list_
+    
+    def compile_DictionaryNode(self, node: DictionaryNode):
+        key_closures = [self.compile(key_node) for key_node in node.node_dictionary.keys()]
+        value_closures = [self.compile(value_node) for value_node in node.node_dictionary.values()]
+        start_position, end_position = node.start_position, node.end_position
+
+        def dictionary(context: Context) -> Dictionary:
+            keys = [key_closure(context) for key_closure in key_closures]
+            values = [value_closure(context) for value_closure in value_closures]
+
+            return Dictionary({ key.frozen(): value for key, value in zip(keys, values) })\
+                .set_position(start_position, end_position)\
+                .set_context(context)
+
+        return dictionary
+    
+    def compile_BinaryOperationNode(self, node: BinaryOperationNode):
+        left_node, right_node = node.left_node, node.right_node
+        left_closure = self.compile(left_node)
+        right_closure = self.compile(right_node)
+        start_position, end_position = node.start_position, node.end_position
+
+        operation = node.operation
+        short_circuit = node.short_circuit
+
+        def binary_operation(context: Context) -> Value:
+            left = left_closure(context)
+
+            if short_circuit is not None and bool(unwrap(left.to_boolean()).value) == short_circuit:
+                output = boolean_value(short_circuit)
+            else:
+                right = right_closure(context)
+
+                if left.interned: left = positioned(left, left_node, context)
+                if right.interned: right = positioned(right, right_node, context)
+
+                output = unwrap(getattr(left, operation)(right))
+
+            return output\
+                .set_context(context)\
+                .set_position(start_position, end_position)
+
+        return binary_operation
+    
+    def compile_UnaryOperationNode(self, node: UnaryOperationNode):
+        closure = self.compile(node.node)
+        start_position, end_position = node.start_position, node.end_position
+
+        negate = node.operation_token.type == TT_SUBTRACT
+
+        if negate:
+            operation = lambda number: number.multiplied_by(number_value(-1))
+        elif node.operation_token.matches(TT_KEYWORD, 'not'):
+            operation = lambda number: number.not_()
+        else:
+            operation = None
+
+        def unary_operation(context: Context) -> Value:
+            number = closure(context)
+
+            if operation is not None:
+                if negate and number.interned: number = positioned(number, node.node, context)
+                number = unwrap(operation(number))
+
+            return number\
+                .set_context(context)\
+                .set_position(start_position, end_position)
+
+        return unary_operation
+    
+    def compile_VariableNode(self, node: VariableNode):
+        name_key = node.name_key
+
+        if name_key is not None and not node.scope_node:
+            def static_variable(context: Context) -> tuple:
+                return (name_key, context.symbol_table, False)
+
+            return static_variable
+
+        name_closure = self.compile(node.variable_name_node) if name_key is None else None
+        scope_closure = self.compile(node.scope_node) if node.scope_node else None
+
+        def variable(context: Context) -> tuple:
+            variable_name = name_key if name_closure is None else name_closure(context)
+            if scope_closure is None: return (variable_name, context.symbol_table, False)
+
+            scope = unwrap(resolve_scope(node, scope_closure(context), context))
+            return (variable_name, scope, True)
+
+        return variable
+    
+    def compile_VariableAccessNode(self, node: VariableAccessNode):
+        variable_closure = self.compile(node.variable_node)
+        start_position, end_position = node.start_position, node.end_position
+
+        def variable_access(context: Context) -> Value:
+            variable_name, scope, explicit = variable_closure(context)
+            value = scope.get(variable_name, explicit)
+
+            if not value:
+                raise RuntimeFailure(RuntimeError(
+                    start_position, end_position,
+                    f"Variable '{variable_name}' is not defined.",
+                    context
+                ))
+
+            return value.copy().set_position(start_position, end_position)
+
+        return variable_access
+    
+    def compile_VariableAssignmentNode(self, node: VariableAssignmentNode):
+        variable_closure = self.compile(node.variable_node)
+        value_closure = self.compile(node.value_node)
+
+        def variable_assignment(context: Context) -> Value:
+            variable_name, scope, explicit = variable_closure(context)
+            value = value_closure(context)
+
+            assign_variable(variable_name, scope, explicit, value, context)
+            return value
+
+        return variable_assignment
+    
+    def compile_CallNode(self, node: CallNode):
+        call_closure = self.compile(node.node_to_call)
+        argument_closures = [self.compile(argument_node) for argument_node in node.argument_nodes]
+        start_position, end_position = node.start_position, node.end_position
+
+        def call(context: Context) -> Value:
+            value_to_call = inlined_built_in(node, context)
+            if value_to_call is None: value_to_call = call_closure(context)
+            arguments = [argument_closure(context) for argument_closure in argument_closures]
+
+            return unwrap(call_value(value_to_call, arguments, start_position, end_position))
+
+        return call
+    
+    def compile_IndexingNode(self, node: IndexingNode):
+        base_closure = self.compile(node.base_node)
+        index_closure = self.compile(node.index_node)
+        allow_methods = node.allow_methods
+
+        def indexing(context: Context) -> Value:
+            base_value = base_closure(context)
+            index_value = index_closure(context)
+
+            if allow_methods:
+                function = resolve_method(node, base_value, index_value, context)
+                if function is not None: return function
+
+            if base_value.interned: base_value = positioned(base_value, node.base_node, context)
+            if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+
+            return unwrap(base_value.index(index_value)).set_context(index_value.context)
+
+        return indexing
+    
+    def compile_IndexAssignmentNode(self, node: IndexAssignmentNode):
+        base_closure = self.compile(node.indexing_node.base_node)
+        index_closure = self.compile(node.indexing_node.index_node)
+        value_closure = self.compile(node.value_node)
+        variable_closure = self.compile(node.variable_node)
+
+        target_key = node.target_key
+        base_node = node.indexing_node.base_node
+        index_node = node.indexing_node.index_node
+
+        def index_assignment(context: Context) -> Value:
+            base_value = None
+
+            if target_key is not None:
+                base_value = owned_index_target(target_key, context)
+                if base_value is not None: base_value.set_position(base_node.start_position, base_node.end_position)
+
+            if base_value is None:
+                base_value = base_closure(context)
+                if base_value.interned: base_value = positioned(base_value, base_node, context)
+
+            index_value = index_closure(context)
+            if index_value.interned: index_value = positioned(index_value, index_node, context)
+
+            value_value = value_closure(context)
+            output_value = unwrap(base_value.assign_index(index_value, value_value))
+
+            variable_name, scope, explicit = variable_closure(context)
+            assign_index_variable(variable_name, scope, explicit, base_value, output_value, context)
+
+            return NULL.set_context(index_value.context)
+
+        return index_assignment
+    
+    def compile_ValueNode(self, node: ValueNode):
+        value = node.value
+        return lambda context: value
+    
+    def compile_NullNode(self, node: NullNode):
+        return lambda context: NULL
+    
+    def compile_GlobalScopeNode(self, node: GlobalScopeNode):
+        return lambda context: global_symbol_table
+    
+    def compile_DefaultScopeNode(self, node: DefaultScopeNode):
+        return lambda context: default_symbol_table
+    
+    def compile_ConstantNode(self, node: ConstantNode):
+        value = node.value
+        start_position, end_position = node.start_position, node.end_position
+
+        def constant(context: Context) -> Value:
+            return value.copy()\
+                .set_position(start_position, end_position)\
+                .set_context(context)
+
+        return constant
+    
+    def compile_BranchNode(self, node: BranchNode):
+        guard_closure = self.compile(node.guard_node) if node.guard_node is not None else None
+        body_closure = self.compile(node.body_node) if node.body_node is not None else None
+        chained = node.chained
+
+        def branch(context: Context) -> Value:
+            if guard_closure is not None and not booleans_are_default():
+                return guard_closure(context)
+            
+            if body_closure is None:
+                return NULL.set_context(context)
+            
+            value_to_call = body_closure(context)
+
+            if chained:
+                return value_to_call.set_context(context)
+            
+            return unwrap(value_to_call.execute([]))
+
+        return branch
+    
+    def compile_IfNode(self, node: IfNode):
+        condition_closure = self.compile(node.condition_node)
+        true_closure = self.compile(node.true_node)
+        false_closure = self.compile(node.false_node) if node.false_node is not None else None
+        false_is_if = isinstance(node.false_node, IfNode)
+
+        def if_(context: Context) -> Value:
+            condition = condition_closure(context)
+            condition_boolean = unwrap(condition.to_boolean())
+
+            if condition_boolean.value == 1:
+                value_to_call = true_closure(context)
+                return unwrap(value_to_call.execute([]))
+            
+            if condition_boolean.value == 0 and false_closure is not None:
+                value_to_call = false_closure(context)
+
+                if false_is_if:
+                    return value_to_call.set_context(context)
+
+                return unwrap(value_to_call.execute([]))
+
+            return NULL.set_context(context)
+
+        return if_
+    
+    def compile_WhileNode(self, node: WhileNode):
+        condition_closure = self.compile(node.condition_node)
+        while_closure = self.compile(node.while_node)
+
+        def while_(context: Context) -> Value:
+            while True:
+                condition = condition_closure(context)
+                condition_boolean = unwrap(condition.to_boolean())
+
+                if condition_boolean.value == 1:
+                    value_to_call = while_closure(context)
+                    unwrap(value_to_call.execute([]))
+                else:
+                    break
+
+            return NULL.set_context(context)
+
+        return while_
+    
+    ## Quickened Nodes
+
+    # Nodes specialized by the tree engine compile like the nodes they were
+    compile_NumberOperationNode = compile_BinaryOperationNode
+    compile_ListIndexingNode = compile_IndexingNode
+    compile_NameAccessNode = compile_VariableAccessNode
+
+    ## Superinstructions
+
+    def compile_UpdateVariableNode(self, node: UpdateVariableNode):
+        generic_closure = self.compile_VariableAssignmentNode(node)
+
+        def update_variable_(context: Context) -> Value:
+            value = update_variable(node, context)
+            return value if value is not None else generic_closure(context)
+        
+        return update_variable_
+    
+    def compile_CompareVariableNode(self, node: CompareVariableNode):
+        generic_closure = self.compile_BinaryOperationNode(node)
+
+        def compare_variable_(context: Context) -> Value:
+            value = compare_variable(node, context)
+            return value if value is not None else generic_closure(context)
+        
+        return compare_variable_
+    
+    def compile_IndexVariableNode(self, node: IndexVariableNode):
+        generic_closure = self.compile_IndexingNode(node)
+
+        def index_variables_(context: Context) -> Value:
+            value = index_variables(node, context)
+            return value if value is not None else generic_closure(context)
+        
+        return index_variables_
+
+closure_compiler = ClosureCompiler()
+
+#endregion
+
+
+#region COMPILER
+
+## Opcodes
+
+OP_NUMBER = 0
+OP_TEXT = 1
+OP_NULL = 2
+OP_VALUE = 3
+OP_GLOBAL_SCOPE = 4
+OP_DEFAULT_SCOPE = 5
+OP_LIST = 6
+OP_DICTIONARY = 7
+OP_BINARY = 8
+OP_UNARY = 9
+OP_ACCESS = 10
+OP_STORE = 11
+OP_SHORT_CIRCUIT = 12
+OP_CALL = 13
+OP_INDEX = 14
+OP_ASSIGN_INDEX = 15
+OP_STORE_INDEX = 16
+OP_JUMP = 17
+OP_JUMP_IF_FALSE = 18
+OP_EXECUTE = 19
+OP_SET_CONTEXT = 20
+OP_NULL_CONTEXT = 21
+OP_POP = 22
+OP_ACCESS_TARGET = 23
+OP_CONSTANT = 24
+OP_NUMBER_BINARY = 25
+OP_LIST_INDEX = 26
+OP_UPDATE_VARIABLE = 27
+OP_COMPARE_VARIABLE = 28
+OP_INDEX_VARIABLES = 29
+OP_BUILT_IN = 30
+OP_SCOPE = 31
+
+UNARY_NEGATE = 0
+UNARY_NOT = 1
+UNARY_IDENTITY = 2
+
+class Chunk:
+    def __init__(self):
+        self.codes = []
+        self.arguments = []
+        self.nodes = []
+
+    def emit(self, code: int, argument = None, node: Node | None = None) -> int:
+        self.codes.append(code)
+        self.arguments.append(argument)
+        self.nodes.append(node)
+
+        return len(self.codes) - 1
+    
+    def patch(self, index: int, argument):
+        self.arguments[index] = argument
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+class Compiler:
+    def compile(self, node: Node) -> Chunk:
+        if node.chunk is None:
+            chunk = Chunk()
+            self.emit(node, chunk)
+
+            node.chunk = chunk
+
+        return node.chunk
+
+    def emit(self, node: Node, chunk: Chunk):
+        method_name = f'compile_{type(node).__name__}'
+
+        method = getattr(self, method_name, self.no_compile_method)
+        method(node, chunk)
+
+    def no_compile_method(self, node: Node, chunk: Chunk):
+        raise NotImplementedError(f'No compile method was defined for {type(node).__name__}.')
+
+    ## Compile Methods
+
+    def compile_NumberNode(self, node: NumberNode, chunk: Chunk):
+        chunk.emit(OP_NUMBER, node.token.value, node)
+
+    def compile_TextNode(self, node: TextNode, chunk: Chunk):
+        chunk.emit(OP_TEXT, node.token.value, node)
+
+    def compile_ListNode(self, node: ListNode, chunk: Chunk):
+        for element_node in node.element_nodes:
+            self.emit(element_node, chunk)
+
+        chunk.emit(OP_LIST, len(node.element_nodes), node)
+
+    def compile_DictionaryNode(self, node: DictionaryNode, chunk: Chunk):
+        for key_node in node.node_dictionary.keys():
+            self.emit(key_node, chunk)
+
+        for value_node in node.node_dictionary.values():
+            self.emit(value_node, chunk)
+
+        chunk.emit(OP_DICTIONARY, len(node.node_dictionary), node)
+
+    def compile_BinaryOperationNode(self, node: BinaryOperationNode, chunk: Chunk):
+        self.emit(node.left_node, chunk)
+
+        if node.short_circuit is not None:
+            jump_to_end = chunk.emit(OP_SHORT_CIRCUIT, None, node)
+            self.emit(node.right_node, chunk)
+            chunk.emit(OP_BINARY, node.operation, node)
+            chunk.patch(jump_to_end, len(chunk))
+            return
+
+        self.emit(node.right_node, chunk)
+        chunk.emit(OP_BINARY, node.operation, node)
+
+    def compile_UnaryOperationNode(self, node: UnaryOperationNode, chunk: Chunk):
+        self.emit(node.node, chunk)
+
+        if node.operation_token.type == TT_SUBTRACT:
+            operation = UNARY_NEGATE
+        elif node.operation_token.matches(TT_KEYWORD, 'not'):
+            operation = UNARY_NOT
+        else:
+            operation = UNARY_IDENTITY
 
-            return result.success(return_result)
+        chunk.emit(OP_UNARY, operation, node)
 
-        return result.success(Null().set_context(context))
-    
-    def visit_WhileNode(self, node: WhileNode, context: Context):
+    def compile_VariableNode(self, node: VariableNode, chunk: Chunk):
+        if node.name_key is not None: chunk.emit(OP_VALUE, node.name_key, node)
+        else: self.emit(node.variable_name_node, chunk)
+
+        # Resolved here so an invalid scope fails before the value of an assignment
+        # is evaluated, as in the tree walker
+        if node.scope_node:
+            self.emit(node.scope_node, chunk)
+            chunk.emit(OP_SCOPE, None, node)
+
+    def compile_VariableAccessNode(self, node: VariableAccessNode, chunk: Chunk):
+        self.emit(node.variable_node, chunk)
+        chunk.emit(OP_ACCESS, node.variable_node, node)
+
+    def compile_VariableAssignmentNode(self, node: VariableAssignmentNode, chunk: Chunk):
+        self.emit(node.variable_node, chunk)
+        self.emit(node.value_node, chunk)
+        chunk.emit(OP_STORE, node.variable_node, node)
+
+    def compile_CallNode(self, node: CallNode, chunk: Chunk):
+        # Jumps over the code that reads the callee when the built-in is inlined
+        jump_to_arguments = chunk.emit(OP_BUILT_IN, None, node) if node.built_in_name is not None else None
+        self.emit(node.node_to_call, chunk)
+
+        if jump_to_arguments is not None: chunk.patch(jump_to_arguments, len(chunk))
+
+        for argument_node in node.argument_nodes:
+            self.emit(argument_node, chunk)
+
+        chunk.emit(OP_CALL, len(node.argument_nodes), node)
+
+    def compile_IndexingNode(self, node: IndexingNode, chunk: Chunk):
+        self.emit(node.base_node, chunk)
+        self.emit(node.index_node, chunk)
+        chunk.emit(OP_INDEX, node.allow_methods, node)
+
+    def compile_IndexAssignmentNode(self, node: IndexAssignmentNode, chunk: Chunk):
+        base_node = node.indexing_node.base_node
+
+        if node.target_key is not None:
+            self.emit(base_node.variable_node, chunk)
+            chunk.emit(OP_ACCESS_TARGET, None, base_node)
+            chunk.emit(OP_ACCESS, base_node.variable_node, base_node)
+        else:
+            self.emit(base_node, chunk)
+
+        self.emit(node.indexing_node.index_node, chunk)
+        self.emit(node.value_node, chunk)
+        chunk.emit(OP_ASSIGN_INDEX, None, node)
+
+        self.emit(node.variable_node, chunk)
+        chunk.emit(OP_STORE_INDEX, node.variable_node, node)
+
+    def compile_ValueNode(self, node: ValueNode, chunk: Chunk):
+        chunk.emit(OP_VALUE, node.value, node)
+
+    def compile_NullNode(self, node: NullNode, chunk: Chunk):
+        chunk.emit(OP_NULL, None, node)
+
+    def compile_GlobalScopeNode(self, node: GlobalScopeNode, chunk: Chunk):
+        chunk.emit(OP_GLOBAL_SCOPE, None, node)
+
+    def compile_DefaultScopeNode(self, node: DefaultScopeNode, chunk: Chunk):
+        chunk.emit(OP_DEFAULT_SCOPE, None, node)
+
+    def compile_ConstantNode(self, node: ConstantNode, chunk: Chunk):
+        chunk.emit(OP_CONSTANT, node.value, node)
+
+    def compile_BranchNode(self, node: BranchNode, chunk: Chunk):
+        # Guards are not checked by the VM, it runs the original node
+        if node.guard_node is not None:
+            self.emit(node.guard_node, chunk)
+            return
+        
+        if node.body_node is None:
+            chunk.emit(OP_NULL_CONTEXT, None, node)
+            return
+        
+        self.emit(node.body_node, chunk)
+        chunk.emit(OP_SET_CONTEXT if node.chained else OP_EXECUTE, None, node)
+
+    def compile_IfNode(self, node: IfNode, chunk: Chunk):
+        self.emit(node.condition_node, chunk)
+        jump_to_false = chunk.emit(OP_JUMP_IF_FALSE, None, node)
+
+        self.emit(node.true_node, chunk)
+        chunk.emit(OP_EXECUTE, None, node)
+        jump_to_end = chunk.emit(OP_JUMP, None, node)
+
+        chunk.patch(jump_to_false, len(chunk))
+
+        if node.false_node is not None:
+            self.emit(node.false_node, chunk)
+
+            if isinstance(node.false_node, IfNode):
+                chunk.emit(OP_SET_CONTEXT, None, node)
+            else:
+                chunk.emit(OP_EXECUTE, None, node)
+        else:
+            chunk.emit(OP_NULL_CONTEXT, None, node)
+
+        chunk.patch(jump_to_end, len(chunk))
+
+    def compile_WhileNode(self, node: WhileNode, chunk: Chunk):
+        start = len(chunk)
+
+        self.emit(node.condition_node, chunk)
+        jump_to_end = chunk.emit(OP_JUMP_IF_FALSE, None, node)
+
+        self.emit(node.while_node, chunk)
+        chunk.emit(OP_EXECUTE, None, node)
+        chunk.emit(OP_POP, None, node)
+        chunk.emit(OP_JUMP, start, node)
+
+        chunk.patch(jump_to_end, len(chunk))
+        chunk.emit(OP_NULL_CONTEXT, None, node)
+
+    ## Quickened Nodes
+
+    # Nodes specialized by the tree engine compile like the nodes they were
+    compile_NumberOperationNode = compile_BinaryOperationNode
+    compile_ListIndexingNode = compile_IndexingNode
+    compile_NameAccessNode = compile_VariableAccessNode
+
+    ## Superinstructions
+
+    # Each superinstruction jumps over the generic code that follows it when it succeeds
+
+    def compile_UpdateVariableNode(self, node: UpdateVariableNode, chunk: Chunk):
+        jump_to_end = chunk.emit(OP_UPDATE_VARIABLE, None, node)
+        self.compile_VariableAssignmentNode(node, chunk)
+        chunk.patch(jump_to_end, len(chunk))
+
+    def compile_CompareVariableNode(self, node: CompareVariableNode, chunk: Chunk):
+        jump_to_end = chunk.emit(OP_COMPARE_VARIABLE, None, node)
+        self.compile_BinaryOperationNode(node, chunk)
+        chunk.patch(jump_to_end, len(chunk))
+
+    def compile_IndexVariableNode(self, node: IndexVariableNode, chunk: Chunk):
+        jump_to_end = chunk.emit(OP_INDEX_VARIABLES, None, node)
+        self.compile_IndexingNode(node, chunk)
+        chunk.patch(jump_to_end, len(chunk))
+
+compiler = Compiler()
+
+#endregion
+
+
+#region VIRTUAL MACHINE
+
+class VirtualMachine:
+    # Text calls run in the same loop: the caller's state is saved on a list of
+    # frames instead of the Python stack, so recursion depth isn't limited by it
+    def run(self, chunk: Chunk, context: Context) -> RuntimeResult:
         result = RuntimeResult()
+        frames = []
+
+        codes = chunk.codes
+        arguments = chunk.arguments
+        nodes = chunk.nodes
+        length = len(codes)
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        index = 0
 
         while True:
-            condition = result.register(self.visit(node.condition_node, context))
-            if result.error: return result
+            if index == length:
+                value = pop()
+                if not frames: return result.success(value)
 
-            condition_boolean = result.register(condition.to_boolean())
-            if result.error: return result
+                # Return the last statement of the body to the caller
+                codes, arguments, nodes, length, stack, index, context = frames.pop()
+                push = stack.append
+                pop = stack.pop
 
-            if condition_boolean.value == 1:
-                value_to_call = result.register(self.visit(node.while_node, context))
+                push(value.value[len(value.value) - 1])
+                continue
+
+            code = codes[index]
+            argument = arguments[index]
+            node = nodes[index]
+            index += 1
+
+            if code == OP_ACCESS:
+                variable_name, scope, explicit = self.pop_variable(argument, stack, context)
+
+                value = scope.get(variable_name, explicit)
+
+                if not value:
+                    return result.failure(RuntimeError(
+                        node.start_position, node.end_position,
+                        f"Variable '{variable_name}' is not defined.",
+                        context
+                    ))
+
+                push(value.copy().set_position(node.start_position, node.end_position))
+
+            elif code == OP_ACCESS_TARGET:
+                # Followed by an OP_ACCESS for containers that can't be updated in place
+                value = owned_index_target(stack[-1], context)
+
+                if value is not None:
+                    pop()
+                    push(value.set_position(node.start_position, node.end_position))
+
+                    index += 1
+
+            elif code == OP_NUMBER:
+                push(Number(argument)
+                    .set_context(context)
+                    .set_position(node.start_position, node.end_position))
+
+            elif code == OP_BINARY:
+                right = pop()
+                left = pop()
+
+                if node.hits is not None and type(left) is Number and type(right) is Number:
+                    node.hits += 1
+
+                    if node.hits >= QUICKENING_THRESHOLD:
+                        codes[index - 1] = OP_NUMBER_BINARY
+                        arguments[index - 1] = NUMBER_OPERATIONS[argument]
+                        quickening.specialize(node)
+
+                if left.interned: left = positioned(left, node.left_node, context)
+                if right.interned: right = positioned(right, node.right_node, context)
+
+                output = result.register(getattr(left, argument)(right))
+                if result.error: return result
+
+                push(output
+                    .set_context(context)
+                    .set_position(node.start_position, node.end_position))
+
+            elif code == OP_NUMBER_BINARY:
+                right = pop()
+                left = pop()
+
+                # Rewritten back and run again as an OP_BINARY when the guard fails
+                if type(left) is not Number or type(right) is not Number:
+                    codes[index - 1] = OP_BINARY
+                    arguments[index - 1] = node.operation
+                    quickening.despecialize(node)
+
+                    push(left)
+                    push(right)
+
+                    index -= 1
+                    continue
+
+                output = argument(left.value, right.value)
+
+                if type(output) is bool:
+                    push(boolean_value(output))
+                    continue
+
+                number = Number(output)
+                number.context = context
+                number.start_position = node.start_position
+                number.end_position = node.end_position
+
+                push(number)
+
+            elif code == OP_LIST_INDEX:
+                index_value = pop()
+                base_value = pop()
+
+                if type(base_value) is not List or type(index_value) is not Number:
+                    codes[index - 1] = OP_INDEX
+                    quickening.despecialize(node)
+
+                    push(base_value)
+                    push(index_value)
+
+                    index -= 1
+                    continue
+
+                position = index_value.value
+
+                # Errors are left to List.index
+                if not (0 <= position < len(base_value.value) and position.is_integer()):
+                    if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+                    return result.failure(base_value.index(index_value).error)
+                
+                element = base_value.value[int(position)]
+                if element.interned: element = element.copy()
+
+                push(element
+                    .set_position(node.base_node.start_position, node.index_node.end_position)
+                    .set_context(index_value.context))
+
+            elif code == OP_UPDATE_VARIABLE:
+                value = update_variable(node, context)
+
+                if value is not None:
+                    push(value)
+                    index = argument
+
+            elif code == OP_COMPARE_VARIABLE:
+                value = compare_variable(node, context)
+
+                if value is not None:
+                    push(value)
+                    index = argument
+
+            elif code == OP_INDEX_VARIABLES:
+                value = index_variables(node, context)
+
+                if value is not None:
+                    push(value)
+                    index = argument
+
+            elif code == OP_BUILT_IN:
+                value = inlined_built_in(node, context)
+
+                if value is not None:
+                    push(value)
+                    index = argument
+
+            elif code == OP_TEXT:
+                push(Text(argument)
+                    .set_context(context)
+                    .set_position(node.start_position, node.end_position))
+
+            elif code == OP_STORE:
+                value = pop()
+
+                variable_name, scope, explicit = self.pop_variable(argument, stack, context)
+
+                assign_variable(variable_name, scope, explicit, value, context)
+                push(value)
+
+            elif code == OP_JUMP_IF_FALSE:
+                condition_boolean = result.register(pop().to_boolean())
+                if result.error: return result
+
+                if condition_boolean.value != 1:
+                    index = argument
+
+            elif code == OP_JUMP:
+                index = argument
+
+            elif code == OP_SHORT_CIRCUIT:
+                left_boolean = result.register(stack[-1].to_boolean())
+                if result.error: return result
+
+                if bool(left_boolean.value) == node.short_circuit:
+                    pop()
+                    push(boolean_value(node.short_circuit)
+                        .set_context(context)
+                        .set_position(node.start_position, node.end_position))
+
+                    index = argument
+
+            elif code == OP_EXECUTE:
+                value_to_call = pop()
+
+                if type(value_to_call) is Text:
+                    call = result.register(self.enter(value_to_call, [], value_to_call.start_position))
+                    if result.error: return result
+
+                    frames.append((codes, arguments, nodes, length, stack, index, context))
+
+                    chunk, context = call
+                    codes, arguments, nodes, length = chunk.codes, chunk.arguments, chunk.nodes, len(chunk.codes)
+
+                    stack = []
+                    push = stack.append
+                    pop = stack.pop
+
+                    index = 0
+                    continue
+
+                return_value = result.register(value_to_call.execute([]))
+                if result.error: return result
+
+                push(return_value)
+
+            elif code == OP_POP:
+                pop()
+
+            elif code == OP_CALL:
+                call_arguments = stack[len(stack) - argument:] if argument else []
+                del stack[len(stack) - argument:]
+
+                value_to_call = pop()
+
+                if type(value_to_call) is Text:
+                    call = result.register(self.enter(value_to_call, call_arguments, node.start_position))
+                    if result.error: return result
+
+                    frames.append((codes, arguments, nodes, length, stack, index, context))
+
+                    chunk, context = call
+                    codes, arguments, nodes, length = chunk.codes, chunk.arguments, chunk.nodes, len(chunk.codes)
+
+                    stack = []
+                    push = stack.append
+                    pop = stack.pop
+
+                    index = 0
+                    continue
+
+                return_value = result.register(call_value(value_to_call, call_arguments, node.start_position, node.end_position))
+                if result.error: return result
+
+                # Copies held by the loop's variables count as holders of their storage
+                # until they are overwritten, which would make the next in-place update copy
+                call_arguments = None
+                push(return_value)
+
+            elif code == OP_INDEX:
+                index_value = pop()
+                base_value = pop()
+
+                if argument:
+                    function = resolve_method(node, base_value, index_value, context)
+
+                    if function is not None:
+                        push(function)
+                        continue
+
+                elif node.hits is not None and type(base_value) is List and type(index_value) is Number:
+                    node.hits += 1
+
+                    if node.hits >= QUICKENING_THRESHOLD:
+                        codes[index - 1] = OP_LIST_INDEX
+                        quickening.specialize(node)
+
+                if base_value.interned: base_value = positioned(base_value, node.base_node, context)
+                if index_value.interned: index_value = positioned(index_value, node.index_node, context)
+
+                index_result = result.register(base_value.index(index_value))
+                if result.error: return result
+
+                push(index_result.set_context(index_value.context))
+
+            elif code == OP_LIST:
+                elements = stack[len(stack) - argument:] if argument else []
+                del stack[len(stack) - argument:]
+
+                # The last statement of a body is what a Text call returns
+                if elements and elements[-1].interned: elements[-1] = positioned(elements[-1], node.element_nodes[-1], context)
+
+                push(List(elements)
+                    .set_position(node.start_position, node.end_position)
+                    .set_context(context))
+
+            elif code == OP_DICTIONARY:
+                values = stack[len(stack) - argument:] if argument else []
+                del stack[len(stack) - argument:]
+
+                keys = stack[len(stack) - argument:] if argument else []
+                del stack[len(stack) - argument:]
+
+                push(Dictionary({ key.frozen(): value for key, value in zip(keys, values) })
+                    .set_position(node.start_position, node.end_position)
+                    .set_context(context))
+
+            elif code == OP_UNARY:
+                number = pop()
+
+                if argument == UNARY_NEGATE:
+                    if number.interned: number = positioned(number, node.node, context)
+                    number = result.register(number.multiplied_by(number_value(-1)))
+                elif argument == UNARY_NOT:
+                    number = result.register(number.not_())
+
+                if result.error: return result
+
+                push(number
+                    .set_context(context)
+                    .set_position(node.start_position, node.end_position))
+
+            elif code == OP_ASSIGN_INDEX:
+                value_value = pop()
+                index_value = pop()
+                base_value = pop()
+
+                if base_value.interned: base_value = positioned(base_value, node.indexing_node.base_node, context)
+                if index_value.interned: index_value = positioned(index_value, node.indexing_node.index_node, context)
+
+                push(index_value.context)
+                push(base_value)
+
+                push(result.register(base_value.assign_index(index_value, value_value)))
+                if result.error: return result
+
+            elif code == OP_STORE_INDEX:
+                variable_name, scope, explicit = self.pop_variable(argument, stack, context)
+
+                # The updated container stays on the stack instead of a variable of the loop
+                assign_index_variable(variable_name, scope, explicit, stack[-2], stack[-1], context)
+                index_context = stack[-3]
+
+                del stack[-3:]
+                push(NULL.set_context(index_context))
+
+            elif code == OP_SCOPE:
+                scope = result.register(resolve_scope(node, pop(), context))
                 if result.error: return result
 
-                result.register(value_to_call.execute([]))
-                if result.error: return result            
+                push(scope)
+
+            elif code == OP_SET_CONTEXT:
+                push(pop().set_context(context))
+
+            elif code == OP_NULL_CONTEXT:
+                push(NULL.set_context(context))
+
+            elif code == OP_NULL:
+                push(NULL)
+
+            elif code == OP_VALUE:
+                push(argument)
+
+            elif code == OP_CONSTANT:
+                push(argument.copy()
+                    .set_position(node.start_position, node.end_position)
+                    .set_context(context))
+
+            elif code == OP_GLOBAL_SCOPE:
+                push(global_symbol_table)
+
+            elif code == OP_DEFAULT_SCOPE:
+                push(default_symbol_table)
+
             else:
-                break
+                raise NotImplementedError(f'Unknown opcode: {code}.')
+    
+    def enter(self, function: Text, arguments: list[Value], start_position: Position) -> RuntimeResult:
+        # Prepares a Text call like Text.execute, without running it
+        result = RuntimeResult()
+        new_context = function.new_context(arguments, start_position)
+
+        ast, error = parse('Text', function.value)
+        if error: return result.failure(error)
+
+        return result.success((compiler.compile(ast), new_context))
+
+    def pop_variable(self, node: VariableNode, stack: list, context: Context) -> tuple:
+        if not node.scope_node: return (stack.pop(), context.symbol_table, False)
+
+        # Pushed by OP_SCOPE
+        scope = stack.pop()
+        variable_name = stack.pop()
+
+        return (variable_name, scope, True)
+
+#endregion
+
+
+#region AST CACHE
+
+AST_CACHE_SIZE = 512
+
+class ASTCache:
+    def __init__(self, max_size: int = AST_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_name: str, text: str) -> ListNode | None:
+        key = (file_name, text)
+        ast = self.entries.get(key, None)
+
+        if ast is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+        return ast
+
+    def set(self, file_name: str, text: str, ast: ListNode):
+        if self.max_size <= 0: return
+
+        key = (file_name, text)
+        self.entries[key] = ast
+        self.entries.move_to_end(key)
 
-        return result.success(Null().set_context(context))
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+
+    def resize(self, max_size: int):
+        self.max_size = max_size
+
+        while len(self.entries) > max(max_size, 0):
+            self.entries.popitem(last = False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f'ASTCache: {len(self.entries)}/{self.max_size} entries, {self.hits} hits, {self.misses} misses'
+
+ast_cache = ASTCache()
+
+#endregion
+
+
+#region COMPILED CACHE
+
+COMPILED_CACHE_MAGIC = b'RUNC'
+COMPILED_CACHE_EXTENSION = '.runc'
+COMPILED_CACHE_HEADER = struct.Struct('<4s32sqq32sH')
+
+def get_runtime_fingerprint() -> bytes:
+    stat = os.stat(__file__)
+    return hashlib.sha256(f'{stat.st_mtime_ns}:{stat.st_size}'.encode()).digest()
+
+class CompiledCache:
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.fingerprint = get_runtime_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry_path(self, path: str) -> Path:
+        key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+        return self.directory / (key + COMPILED_CACHE_EXTENSION)
     
+    def get_header(self, path: str, file_name: str, text: str) -> bytes:
+        stat = os.stat(path)
+        content_hash = hashlib.sha256(text.encode()).digest()
+        encoded_file_name = file_name.encode()
+
+        return COMPILED_CACHE_HEADER.pack(
+            COMPILED_CACHE_MAGIC, self.fingerprint,
+            stat.st_mtime_ns, stat.st_size,
+            content_hash, len(encoded_file_name)
+        ) + encoded_file_name
+
+    def load(self, path: str, file_name: str, text: str) -> ListNode | None:
+        try:
+            header = self.get_header(path, file_name, text)
+
+            with open(self.get_entry_path(path), 'rb') as file:
+                data = file.read()
+
+            if not data.startswith(header):
+                self.misses += 1
+                return None
+            
+            ast = pickle.loads(zlib.decompress(data[len(header):]))
+
+        except Exception:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return ast
+
+    def store(self, path: str, file_name: str, text: str, ast: ListNode):
+        temporary_path = None
+
+        try:
+            header = self.get_header(path, file_name, text)
+            payload = zlib.compress(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL))
+
+            self.directory.mkdir(parents = True, exist_ok = True)
+            descriptor, temporary_path = tempfile.mkstemp(dir = self.directory, suffix = '.tmp')
+
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(header + payload)
+
+            os.replace(temporary_path, self.get_entry_path(path))
+            temporary_path = None
+
+        except Exception:
+            pass
+
+        finally:
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def clear(self):
+        if not self.directory.exists(): return
+
+        for entry in self.directory.glob('*' + COMPILED_CACHE_EXTENSION):
+            try: entry.unlink()
+            except OSError: pass
+
+CACHE_DIR = Path(user_cache_dir(APP_NAME))
+compiled_cache = CompiledCache(CACHE_DIR)
+
 #endregion
 
 
 #region RUN
 
+ENGINES = ('tree', 'vm', 'closure')
+engine = 'tree'
+optimization = False
+optimization_report = False
+
+def set_engine(name: str):
+    global engine
+
+    if name not in ENGINES:
+        raise ValueError(f'Unknown engine: {name}')
+    
+    engine = name
+
+def set_optimization(enabled: bool, report: bool = False):
+    global optimization, optimization_report
+
+    # Cached ASTs were parsed for the previous setting
+    if enabled != optimization: ast_cache.clear()
+    optimization = enabled
+    optimization_report = report
+
 def make_tokens(file_name: str, text: str) -> list[Token]:
     lexer = Lexer(file_name, text)
     tokens, error = lexer.make_tokens()
@@ -5292,19 +7535,78 @@ def generate_ast(tokens: list[Token]) -> ParseResult:
 
     return ast
 
+def generate_ast_incremental(file_name: str, text: str):
+    lexer = Lexer(file_name, text)
+    tokens = TokenStream(lexer.generate_tokens())
+
+    # Lexing errors anywhere in the file take precedence over parsing errors,
+    # the parser may stop early or fail on the tokens before them
+    try:
+        result = Parser(tokens).parse()
+    except Exception:
+        tokens.drain()
+        if lexer.error: return None, lexer.error
+
+        raise
+
+    tokens.drain()
+    if lexer.error: return None, lexer.error
+
+    return result, None
+
+def optimize_ast(ast: ListNode) -> ListNode:
+    if not optimization: return ast
+    ast = optimizer.optimize_program(ast)
+
+    # Text bodies are optimized the first time they are called, each with its own report
+    if optimization_report and optimizer.changes: print(optimizer.report(), file = stderr)
+
+    return ast
+
 def interpret_ast(ast: Node, context: Context = global_context):
+    context = context if context else global_context
+
+    if engine == 'vm':
+        return VirtualMachine().run(compiler.compile(ast), context)
+    
+    if engine == 'closure':
+        return closure_compiler.run(ast, context)
+
     interpreter = Interpreter()
 
-    result = interpreter.visit(ast.node, context if context else global_context)
-    return result
+    # Same as Interpreter.visit, inlined to keep a frame per Text call off the stack
+    try:
+        return RuntimeResult().success(interpreter.evaluate(ast, context))
+    except RuntimeFailure as failure:
+        return RuntimeResult().failure(failure.error)
+
+def parse(file_name: str, text: str, path: str | None = None):
+    ast = ast_cache.get(file_name, text)
+    if ast is not None: return ast, None
+
+    if path is not None:
+        ast = compiled_cache.load(path, file_name, text)
+
+        if ast is not None:
+            ast = optimize_ast(ast)
+            ast_cache.set(file_name, text, ast)
 
+            return ast, None
 
-def run(file_name, text, context: Context = global_context):
-    tokens, error = make_tokens(file_name, text)
+    result, error = generate_ast_incremental(file_name, text)
     if error: return None, error
+    if result.error: return None, result.error
 
-    ast = generate_ast(tokens)
-    if ast.error: return None, ast.error
+    if path is not None: compiled_cache.store(path, file_name, text, result.node)
+
+    ast = optimize_ast(result.node)
+    ast_cache.set(file_name, text, ast)
+
+    return ast, None
+
+def run(file_name, text, context: Context = global_context, path: str | None = None):
+    ast, error = parse(file_name, text, path)
+    if error: return None, error
 
     result = interpret_ast(ast, context)
     return result.value, result.error